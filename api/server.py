@@ -4,24 +4,159 @@ FastAPI server for apartment address evaluation
 
 import os
 import sys
+import time
+import logging
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from typing import Dict, Optional
 from datetime import datetime
+import httpx
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 # Add parent directory to path to import src modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from src.main_async import evaluate_address_async
+from src.main_async import evaluate_address_async, use_eager_tasks
 
 # Load environment variables
 load_dotenv()
 
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+logger = logging.getLogger(__name__)
+
+# In-memory LRU cache for evaluations (24-hour TTL)
+CACHE_TTL_SECONDS = 24 * 3600
+CACHE_MAX_ENTRIES = 512
+CACHE_SWEEP_INTERVAL_SECONDS = 5 * 60
+
+# Maps normalized address -> {"expires_at": monotonic deadline, "payload": result},
+# ordered from least to most recently used
+evaluation_cache: "OrderedDict[str, Dict]" = OrderedDict()
+
+# Shared Redis cache used instead of evaluation_cache when REDIS_URL is set,
+# so every worker sees the same entries
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_KEY_PREFIX = "evaluation:"
+
+
+async def _sweep_expired_cache_entries():
+    """Periodically drop expired entries so stale results don't linger"""
+    while True:
+        await asyncio.sleep(CACHE_SWEEP_INTERVAL_SECONDS)
+        now = time.monotonic()
+        expired = [key for key, entry in evaluation_cache.items() if entry["expires_at"] <= now]
+        for key in expired:
+            evaluation_cache.pop(key, None)
+
+
+# Formatted timestamp for the current second, regenerated at most once per second
+_ts_cache = {"sec": 0, "s": ""}
+
+
+def _now_iso() -> str:
+    """Current local time as an ISO-8601 string with second precision"""
+    sec = int(time.time())
+    if sec != _ts_cache["sec"]:
+        _ts_cache["sec"] = sec
+        _ts_cache["s"] = datetime.fromtimestamp(sec).isoformat()
+    return _ts_cache["s"]
+
+
+def _norm(address: str) -> str:
+    """Normalized, interned cache key for an address"""
+    return sys.intern(address.strip().lower())
+
+
+async def _cache_get(cache_key: str) -> Optional[Dict]:
+    """Return a fresh cached evaluation, or None on a miss"""
+    redis = app.state.redis
+    if redis is not None:
+        try:
+            raw = await redis.get(REDIS_KEY_PREFIX + cache_key)
+        except Exception as e:
+            logger.warning("Redis lookup failed, treating as cache miss: %s", e)
+            return None
+        return orjson.loads(raw) if raw is not None else None
+    
+    entry = evaluation_cache.get(cache_key)
+    if entry is None:
+        return None
+    if entry["expires_at"] > time.monotonic():
+        evaluation_cache.move_to_end(cache_key)
+        return entry["payload"]
+    # Remove stale cache entry
+    del evaluation_cache[cache_key]
+    return None
+
+
+async def _cache_set(cache_key: str, result: Dict):
+    """Store an evaluation for CACHE_TTL_SECONDS"""
+    redis = app.state.redis
+    if redis is not None:
+        try:
+            await redis.set(REDIS_KEY_PREFIX + cache_key, orjson.dumps(result), ex=CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning("Redis store failed, result not cached: %s", e)
+        return
+    
+    evaluation_cache[cache_key] = {
+        "expires_at": time.monotonic() + CACHE_TTL_SECONDS,
+        "payload": result,
+    }
+    while len(evaluation_cache) > CACHE_MAX_ENTRIES:
+        evaluation_cache.popitem(last=False)
+
+
+async def _redis_cache_keys(redis) -> list:
+    """Normalized addresses currently cached in Redis"""
+    return [
+        key.decode()[len(REDIS_KEY_PREFIX):]
+        async for key in redis.scan_iter(match=REDIS_KEY_PREFIX + "*")
+    ]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up shared resources for the lifetime of the app"""
+    use_eager_tasks()
+    
+    # One pooled HTTP/2 client so concurrent Google Maps calls multiplex over
+    # kept-alive connections
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=64)
+    )
+    
+    # Redis expires keys itself; the sweeper only maintains the in-process cache
+    sweeper = None
+    if REDIS_URL:
+        import redis.asyncio
+        app.state.redis = redis.asyncio.from_url(REDIS_URL)
+    else:
+        app.state.redis = None
+        sweeper = asyncio.create_task(_sweep_expired_cache_entries())
+    try:
+        yield
+    finally:
+        if sweeper is not None:
+            sweeper.cancel()
+        if app.state.redis is not None:
+            await app.state.redis.aclose()
+        await app.state.http.aclose()
+
+
 app = FastAPI(
     title="NYC Apartment Evaluator API",
     description="Evaluate apartment addresses based on commute times, transit access, and amenities",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS for browser extension
@@ -33,10 +168,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory cache for evaluations (24-hour TTL)
-evaluation_cache: Dict[str, Dict] = {}
-
-
 class EvaluationRequest(BaseModel):
     """Request body for address evaluation"""
     address: str = Field(..., description="Full street address to evaluate", min_length=5)
@@ -77,7 +208,7 @@ async def health_check():
     google_api_key = os.getenv('GOOGLE_MAPS_API_KEY')
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _now_iso(),
         "google_maps_configured": bool(google_api_key)
     }
 
@@ -91,24 +222,20 @@ async def evaluate(request: EvaluationRequest):
     """
     try:
         # Check cache first
-        cache_key = request.address.lower().strip()
-        if cache_key in evaluation_cache:
-            cached_result = evaluation_cache[cache_key]
-            # Check if cache is less than 24 hours old
-            cached_time = datetime.fromisoformat(cached_result['timestamp'])
-            age_hours = (datetime.now() - cached_time).total_seconds() / 3600
-            
-            if age_hours < 24:
-                print(f"Cache hit for address: {request.address}")
-                cached_result['cached'] = True
-                return cached_result
-            else:
-                # Remove stale cache entry
-                del evaluation_cache[cache_key]
+        cache_key = _norm(request.address)
+        cached_result = await _cache_get(cache_key)
+        if cached_result is not None:
+            logger.info("Cache hit for address: %s", request.address)
+            cached_result['cached'] = True
+            return cached_result
         
         # Evaluate address
-        print(f"Evaluating address: {request.address}")
-        result = await evaluate_address_async(request.address, custom_offices=request.offices)
+        logger.info("Evaluating address: %s", request.address)
+        result = await evaluate_address_async(
+            request.address,
+            custom_offices=request.offices,
+            http_client=app.state.http
+        )
         
         # Check for errors
         if 'error' in result:
@@ -116,33 +243,59 @@ async def evaluate(request: EvaluationRequest):
         
         # Cache the result
         result['cached'] = False
-        evaluation_cache[cache_key] = result
+        await _cache_set(cache_key, result)
         
         return result
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error evaluating address: {e}")
+        logger.exception("Error evaluating address: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
 @app.delete("/cache")
 async def clear_cache():
     """Clear the evaluation cache"""
+    redis = app.state.redis
+    if redis is not None:
+        keys = [REDIS_KEY_PREFIX + key for key in await _redis_cache_keys(redis)]
+        if keys:
+            await redis.delete(*keys)
     evaluation_cache.clear()
-    return {"message": "Cache cleared", "timestamp": datetime.now().isoformat()}
+    return {"message": "Cache cleared", "timestamp": _now_iso()}
 
 
 @app.get("/cache/stats")
 async def cache_stats():
     """Get cache statistics"""
+    redis = app.state.redis
+    if redis is not None:
+        addresses = await _redis_cache_keys(redis)
+        return {
+            "backend": "redis",
+            "cached_addresses": len(addresses),
+            "max_entries": None,
+            "addresses": addresses
+        }
     return {
+        "backend": "memory",
         "cached_addresses": len(evaluation_cache),
+        "max_entries": CACHE_MAX_ENTRIES,
         "addresses": list(evaluation_cache.keys())
     }
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers need the app as an import string. Without REDIS_URL each
+    # worker keeps its own in-memory evaluation cache.
+    uvicorn.run(
+        "api.server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="uvloop",
+        http="httptools",
+        log_level="info"
+    )
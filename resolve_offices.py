@@ -4,9 +4,10 @@ Helper script to resolve Google Maps share URLs to full addresses
 
 import sys
 import os
+import asyncio
 from dotenv import load_dotenv
 import googlemaps
-import requests
+import aiohttp
 
 load_dotenv()
 api_key = os.getenv('GOOGLE_MAPS_API_KEY')
@@ -24,36 +25,60 @@ urls = [
     'https://maps.app.goo.gl/4yS8EqFvCW45pamp7',
 ]
 
-print("Resolving Google Maps URLs...\n")
-print("Copy these addresses to src/commute.py:\n")
-
-for i, url in enumerate(urls, 1):
-    try:
-        # Follow redirect to get full URL
-        response = requests.get(url, allow_redirects=True)
-        full_url = response.url
-        
-        # Try to extract place name or coordinates from URL
-        if 'place/' in full_url:
-            place_name = full_url.split('place/')[1].split('/')[0].replace('+', ' ')
-            print(f"Office {i}: '{place_name}'")
-        elif '@' in full_url:
-            # Extract coordinates
-            coords_part = full_url.split('@')[1].split(',')[:2]
-            lat, lon = coords_part[0], coords_part[1]
-            # Reverse geocode
-            result = gmaps.reverse_geocode((float(lat), float(lon)))
-            if result:
-                address = result[0]['formatted_address']
-                print(f"Office {i}: '{address}'")
-            else:
-                print(f"Office {i}: Coordinates ({lat}, {lon})")
+
+async def resolve_redirect(session: aiohttp.ClientSession, url: str) -> str:
+    """Follow a share URL's redirects and return the final URL without downloading the page"""
+    async with session.head(url, allow_redirects=True) as response:
+        if response.status < 400:
+            return str(response.url)
+    
+    # Some hosts reject HEAD; follow with GET but never read the body
+    async with session.get(url, allow_redirects=True) as response:
+        return str(response.url)
+
+
+async def describe_office(session: aiohttp.ClientSession, url: str) -> str:
+    """Resolve a share URL to a place name or reverse-geocoded address"""
+    full_url = await resolve_redirect(session, url)
+    
+    # Try to extract place name or coordinates from URL
+    if 'place/' in full_url:
+        place_name = full_url.split('place/')[1].split('/')[0].replace('+', ' ')
+        return f"'{place_name}'"
+    elif '@' in full_url:
+        # Extract coordinates
+        coords_part = full_url.split('@')[1].split(',')[:2]
+        lat, lon = coords_part[0], coords_part[1]
+        # Reverse geocode (googlemaps is blocking, so run it in a worker thread)
+        result = await asyncio.to_thread(gmaps.reverse_geocode, (float(lat), float(lon)))
+        if result:
+            return f"'{result[0]['formatted_address']}'"
+        return f"Coordinates ({lat}, {lon})"
+    return f"Could not parse - {full_url}"
+
+
+async def main():
+    print("Resolving Google Maps URLs...\n")
+    print("Copy these addresses to src/commute.py:\n")
+    
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        # Resolve every URL concurrently; results come back in input order
+        results = await asyncio.gather(
+            *(describe_office(session, url) for url in urls),
+            return_exceptions=True
+        )
+    
+    for i, result in enumerate(results, 1):
+        if isinstance(result, Exception):
+            print(f"Office {i}: Error - {result}")
         else:
-            print(f"Office {i}: Could not parse - {full_url}")
-            
-    except Exception as e:
-        print(f"Office {i}: Error - {e}")
-
-print("\n" + "="*60)
-print("Update src/commute.py OFFICES dict with these addresses:")
-print("Replace 'url' field with 'address' field for each office")
+            print(f"Office {i}: {result}")
+    
+    print("\n" + "="*60)
+    print("Update src/commute.py OFFICES dict with these addresses:")
+    print("Replace 'url' field with 'address' field for each office")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
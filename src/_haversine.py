@@ -0,0 +1,93 @@
+"""
+Batch nearest-station haversine kernel (Numba JIT when available)
+"""
+
+from typing import Callable, Tuple
+import functools
+import numpy as np
+
+EARTH_RADIUS_MILES = 3958.7613
+
+
+def _nearest_station_batch_numpy(
+    q_lat: np.ndarray,
+    q_lon: np.ndarray,
+    s_lat: np.ndarray,
+    s_lon: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Broadcast (queries x stations) haversine; all inputs in radians"""
+    dlat = s_lat[None, :] - q_lat[:, None]
+    dlon = s_lon[None, :] - q_lon[:, None]
+    a = np.sin(dlat / 2) ** 2 + np.cos(q_lat)[:, None] * np.cos(s_lat)[None, :] * np.sin(dlon / 2) ** 2
+
+    idx = a.argmin(axis=1)
+    best = np.take_along_axis(a, idx[:, None], axis=1)[:, 0]
+    return idx, 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(best))
+
+
+@functools.lru_cache(maxsize=1)
+def _kernel() -> Callable:
+    """
+    Build the batch kernel on first use
+
+    numba takes longer to import than the rest of the CLI combined, so it is
+    only loaded once a batch query actually runs.
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:  # numba is optional; fall back to broadcast NumPy
+        return _nearest_station_batch_numpy
+
+    # No cache=True: this module is imported both as src._haversine and as
+    # _haversine, and numba's on-disk cache pins the first module name
+    @njit(parallel=True, fastmath=True)
+    def _nearest_station_batch_jit(q_lat, q_lon, s_lat, s_lon):
+        n = q_lat.shape[0]
+        m = s_lat.shape[0]
+        idx = np.empty(n, dtype=np.int64)
+        dist = np.empty(n, dtype=np.float64)
+        s_clat = np.cos(s_lat)
+
+        # One apartment per iteration across cores; the station arrays stay hot in cache
+        for i in prange(n):
+            lat0 = q_lat[i]
+            lon0 = q_lon[i]
+            clat0 = np.cos(lat0)
+            best_j = 0
+            best_a = np.inf
+            for j in range(m):
+                a = np.sin((s_lat[j] - lat0) * 0.5) ** 2 + \
+                    clat0 * s_clat[j] * np.sin((s_lon[j] - lon0) * 0.5) ** 2
+                if a < best_a:
+                    best_a = a
+                    best_j = j
+            idx[i] = best_j
+            dist[i] = 2.0 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(best_a))
+
+        return idx, dist
+
+    return _nearest_station_batch_jit
+
+
+def nearest_station_batch(
+    q_lat: np.ndarray,
+    q_lon: np.ndarray,
+    s_lat: np.ndarray,
+    s_lon: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the nearest station for every query point
+
+    Args:
+        q_lat, q_lon: Query coordinates in radians, shape (n,)
+        s_lat, s_lon: Station coordinates in radians, shape (m,), m >= 1
+
+    Returns:
+        (indices into the station arrays, distances in miles), each shape (n,)
+    """
+    return _kernel()(
+        np.ascontiguousarray(q_lat, dtype=np.float64),
+        np.ascontiguousarray(q_lon, dtype=np.float64),
+        np.ascontiguousarray(s_lat, dtype=np.float64),
+        np.ascontiguousarray(s_lon, dtype=np.float64),
+    )
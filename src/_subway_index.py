@@ -0,0 +1,185 @@
+"""
+Shared nearest-station index over the NYC subway station data
+"""
+
+from typing import Dict, Sequence, Tuple
+import numpy as np
+import functools
+import json
+import logging
+import os
+
+try:
+    from src._haversine import EARTH_RADIUS_MILES, nearest_station_batch
+except ImportError:
+    from _haversine import EARTH_RADIUS_MILES, nearest_station_batch
+
+logger = logging.getLogger(__name__)
+
+# Try multiple possible paths
+_POSSIBLE_PATHS = [
+    '../data/subway_stations.json',
+    'data/subway_stations.json',
+    os.path.join(os.path.dirname(__file__), '../data/subway_stations.json'),
+]
+
+
+def _station_dtype(name_width: int, lines_width: int) -> np.dtype:
+    """Record layout of the side-car .npy cache"""
+    return np.dtype([
+        ('lat', 'f8'),
+        ('lon', 'f8'),
+        ('name', f'U{max(name_width, 1)}'),
+        ('lines', f'U{max(lines_width, 1)}'),
+    ])
+
+
+def _pack_stations(stations: Sequence[Dict]) -> np.ndarray:
+    """Convert parsed station dicts into the structured record array"""
+    lines = [','.join(s['lines']) for s in stations]
+    records = np.zeros(
+        len(stations),
+        dtype=_station_dtype(
+            max((len(s['name']) for s in stations), default=1),
+            max((len(l) for l in lines), default=1),
+        ),
+    )
+    records['lat'] = [s['latitude'] for s in stations]
+    records['lon'] = [s['longitude'] for s in stations]
+    records['name'] = [s['name'] for s in stations]
+    records['lines'] = lines
+    return records
+
+
+class SubwayIndex:
+    """
+    Read-only sequence of subway stations backed by a structured record array,
+    with coordinates laid out as radian arrays for nearest-station queries
+    """
+
+    def __init__(self, records: np.ndarray):
+        """
+        Build the index
+
+        Args:
+            records: Structured array with lat/lon/name/lines fields (may be
+                memory-mapped). Shared across every analyzer.
+        """
+        self._records = records
+        lat = np.deg2rad(np.asarray(records['lat'], dtype=np.float64))
+        self._lat = lat
+        self._lon = np.deg2rad(np.asarray(records['lon'], dtype=np.float64))
+        # Precomputed once so a query needs a single cos() over the station arrays.
+        # Kept in float64: float32 cos values near 1 only resolve ~1.4 miles.
+        self._slat = np.sin(lat)
+        self._clat = np.cos(lat)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, idx: int) -> Dict:
+        """Decode one station into the dict shape of subway_stations.json"""
+        record = self._records[idx]
+        lines = str(record['lines'])
+        return {
+            'name': str(record['name']),
+            'lines': lines.split(',') if lines else [],
+            'latitude': float(record['lat']),
+            'longitude': float(record['lon']),
+        }
+
+    def nearest(self, location: Tuple[float, float]) -> Tuple[Dict, float]:
+        """
+        Find the closest station
+
+        Ranks every station by the spherical law of cosines (largest cosine of
+        the central angle is nearest), then computes the haversine distance
+        for the winner only.
+
+        Args:
+            location: (latitude, longitude) to search from
+
+        Returns:
+            (station dict, distance in miles)
+        """
+        lat0 = np.deg2rad(location[0])
+        lon0 = np.deg2rad(location[1])
+
+        cos_d = np.sin(lat0) * self._slat + np.cos(lat0) * self._clat * np.cos(self._lon - lon0)
+        idx = int(cos_d.argmax())
+
+        dlat = self._lat[idx] - lat0
+        dlon = self._lon[idx] - lon0
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat0) * self._clat[idx] * np.sin(dlon / 2) ** 2
+        distance = 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+        return self[idx], float(distance)
+
+    def nearest_batch(self, latitudes: np.ndarray, longitudes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the closest station for many locations at once
+
+        Args:
+            latitudes: Query latitudes in degrees
+            longitudes: Query longitudes in degrees
+
+        Returns:
+            (station indices, distances in miles); indices are -1 and
+            distances NaN when no station data is loaded
+        """
+        q_lat = np.deg2rad(np.asarray(latitudes, dtype=np.float64))
+        q_lon = np.deg2rad(np.asarray(longitudes, dtype=np.float64))
+        if not len(self):
+            return np.full(q_lat.shape, -1, dtype=np.int64), np.full(q_lat.shape, np.nan)
+        return nearest_station_batch(q_lat, q_lon, self._lat, self._lon)
+
+
+def _ensure_npy_cache(path: str) -> np.ndarray:
+    """
+    Load station records from the side-car .npy next to the JSON file
+
+    The .npy is memory-mapped when it is at least as new as the JSON;
+    otherwise the JSON is parsed and the .npy is (re)written for next time.
+    """
+    npy_path = os.path.splitext(path)[0] + '.npy'
+    try:
+        if os.path.getmtime(npy_path) >= os.path.getmtime(path):
+            return np.load(npy_path, mmap_mode='r')
+    except (OSError, ValueError):
+        pass
+
+    with open(path, 'r') as f:
+        records = _pack_stations(json.load(f))
+
+    # Write-then-rename so concurrent workers never map a half-written file
+    tmp_path = f"{npy_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.save(f, records)
+        os.replace(tmp_path, npy_path)
+    except OSError:
+        # Read-only data directory: keep using the parsed records for this process
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return records
+
+
+@functools.lru_cache(maxsize=1)
+def _load_index(path: str, mtime: float) -> SubwayIndex:
+    """Load the station file once per (path, mtime); mtime only busts the cache"""
+    return SubwayIndex(_ensure_npy_cache(path))
+
+
+def get_index() -> SubwayIndex:
+    """Return the shared station index, rebuilding it if the data file changed"""
+    for path in _POSSIBLE_PATHS:
+        try:
+            if os.path.exists(path):
+                return _load_index(os.path.abspath(path), os.path.getmtime(path))
+        except Exception as e:
+            logger.warning("Failed to load %s: %s", path, e)
+            continue
+
+    logger.warning("Could not load subway station data. Using empty list.")
+    return SubwayIndex(_pack_stations([]))
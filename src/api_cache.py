@@ -0,0 +1,110 @@
+"""
+Persistent disk cache for Places API (v1) POST responses
+"""
+
+from typing import Dict, Optional
+import functools
+import hashlib
+import json
+import logging
+import os
+
+import diskcache
+import orjson
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 86400
+CACHE_DIR = os.getenv(
+    'API_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'api'),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _store() -> diskcache.Cache:
+    """Open the cache directory on first use"""
+    return diskcache.Cache(CACHE_DIR)
+
+
+def _quantize_coordinates(value):
+    """
+    Round every nested latitude/longitude in a JSON request body to 4 decimals
+    (~11 m), so nearby locationRestriction queries share entries
+    """
+    if isinstance(value, dict):
+        return {
+            k: round(v, 4) if k in ('latitude', 'longitude') and isinstance(v, float)
+            else _quantize_coordinates(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_quantize_coordinates(v) for v in value]
+    return value
+
+
+def cache_key(url: str, params: Dict) -> str:
+    """
+    Content hash of a request
+
+    Args:
+        url: Endpoint URL
+        params: Everything that shapes the response (request body and field
+            mask); never the API key
+
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    normalized = _quantize_coordinates(params)
+    payload = json.dumps({'url': url, 'params': normalized}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def cached_post(
+    client: httpx.AsyncClient,
+    url: str,
+    body: Dict,
+    headers: Dict[str, str],
+    ttl: int = DEFAULT_TTL_SECONDS,
+) -> Dict:
+    """
+    POST to a Places API (v1) endpoint, serving repeated requests from disk
+
+    Args:
+        client: httpx async client used on a miss
+        url: Endpoint URL
+        body: JSON request body
+        headers: Request headers (API key and field mask)
+        ttl: Seconds to keep a successful response
+
+    Returns:
+        Decoded JSON response
+    """
+    # The field mask changes the response shape, so it is part of the key
+    key: Optional[str] = None
+    if 'pageToken' not in body:
+        key = cache_key(url, {'body': body, 'field_mask': headers.get('X-Goog-FieldMask')})
+        try:
+            hit = _store().get(key)
+        except Exception:
+            logger.exception("API cache read failed; treating as miss")
+            hit = None
+        if hit is not None:
+            return hit
+
+    response = await client.post(url, json=body, headers=headers)
+    data = orjson.loads(response.content)
+
+    if key is not None and response.status_code == 200:
+        try:
+            _store().set(key, data, expire=ttl)
+        except Exception:
+            logger.exception("API cache write failed")
+
+    return data
+
+
+def clear() -> None:
+    """Drop all cached API responses"""
+    _store().clear()
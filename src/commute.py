@@ -2,14 +2,33 @@
 Commute calculator using Google Maps Distance Matrix API
 """
 
-from typing import Dict, List, Optional, Tuple
-import googlemaps
-from datetime import datetime, timedelta
-import os
+from typing import Dict, Optional, Tuple
+from datetime import date, datetime, timedelta
+import functools
+import logging
+from urllib.parse import quote
+import orjson
+import requests
 
+logger = logging.getLogger(__name__)
 
-class CommuteCalculator:
-    """Calculate commute times to office locations"""
+METERS_TO_MILES = 0.000621371
+
+
+@functools.lru_cache(maxsize=4)
+def _next_weekday_morning(today_ordinal: int) -> datetime:
+    """Next weekday at 9 AM after the given day (memoized per calendar day)"""
+    next_day = date.fromordinal(today_ordinal) + timedelta(days=1)
+    
+    # If weekend, move to Monday
+    while next_day.weekday() >= 5:  # 5=Saturday, 6=Sunday
+        next_day += timedelta(days=1)
+    
+    return datetime(next_day.year, next_day.month, next_day.day, 9, 0)
+
+
+class CommuteBase:
+    """Office table, request building and response parsing shared by the sync and async calculators"""
     
     # Office locations
     OFFICES = {
@@ -31,6 +50,11 @@ class CommuteCalculator:
         },
     }
     
+    # Column views of OFFICES, built once at class definition
+    _OFFICE_NAMES = tuple(office['name'] for office in OFFICES.values())
+    _OFFICE_ADDRESSES = tuple(office['address'] for office in OFFICES.values())
+    _DESTINATIONS = "|".join(_OFFICE_ADDRESSES)
+    
     def __init__(self, api_key: str):
         """
         Initialize commute calculator
@@ -38,73 +62,65 @@ class CommuteCalculator:
         Args:
             api_key: Google Maps API key
         """
-        self.client = googlemaps.Client(key=api_key)
-        # Resolve office coordinates on init
-        self.office_coords = self._resolve_office_coordinates()
-        
-    def _resolve_office_coordinates(self) -> Dict[str, str]:
-        """Get office addresses for API calls"""
-        resolved = {}
-        
-        for office_id, office_info in self.OFFICES.items():
-            resolved[office_id] = office_info['address']
-        
-        return resolved
+        self.api_key = api_key
+        self.base_url = "https://maps.googleapis.com/maps/api/distancematrix/json"
+        # Invariant part of the query string, encoded once per calculator
+        self._url_prefix = f"{self.base_url}?mode=transit&units=imperial&key={quote(api_key)}"
+    
+    def _distance_matrix_url(self, origin: str, destination: str, arrival_ts: int) -> str:
+        """
+        Build a Distance Matrix request URL
         
-    def calculate_commutes(
-        self, 
-        origin: Tuple[float, float],
-        arrival_time: Optional[datetime] = None
-    ) -> Dict[str, Dict]:
+        Args:
+            origin: Origin coordinates as "lat,lng"
+            destination: Destination address(es), pipe-separated for a batch
+            arrival_ts: Target arrival time as a Unix timestamp
+            
+        Returns:
+            Fully encoded request URL
         """
-        Calculate morning commute times to all offices
+        return (
+            f"{self._url_prefix}&origins={quote(origin)}"
+            f"&destinations={quote(destination)}"
+            f"&arrival_time={arrival_ts}"
+        )
+    
+    @staticmethod
+    def _commute_error(error: str) -> Dict:
+        """Commute entry for an office whose route could not be calculated"""
+        return {
+            'duration_minutes': None,
+            'distance_miles': None,
+            'mode': 'transit',
+            'meets_preference': False,
+            'error': error
+        }
+    
+    def _parse_distance_matrix(self, response: Dict) -> Dict[str, Dict]:
+        """
+        Turn a batched Distance Matrix response into per-office commute data
         
         Args:
-            origin: (latitude, longitude) of apartment
-            arrival_time: Target arrival time (default: tomorrow 9 AM)
+            response: API response JSON for the _DESTINATIONS batch
             
         Returns:
             Dictionary with commute data for each office
         """
-        if arrival_time is None:
-            # Default to next weekday at 9 AM
-            arrival_time = self._get_next_weekday_morning()
-        
         results = {}
-        origin_str = f"{origin[0]},{origin[1]}"
+        if response.get('status') == 'OK':
+            elements = response['rows'][0]['elements']
+        else:
+            elements = [{'status': response.get('status')}] * len(self._OFFICE_NAMES)
         
-        for office_id, office_location in self.office_coords.items():
-            office_name = self.OFFICES[office_id]['name']
-            
+        for office_name, element in zip(self._OFFICE_NAMES, elements):
             try:
-                if office_location is None:
-                    results[office_name] = {
-                        'duration_minutes': None,
-                        'distance_miles': None,
-                        'mode': 'transit',
-                        'meets_preference': False,
-                        'error': 'Office location not resolved'
-                    }
-                    continue
-                
-                # Call Distance Matrix API
-                result = self.client.distance_matrix(
-                    origins=[origin_str],
-                    destinations=[office_location],
-                    mode="transit",
-                    arrival_time=arrival_time,
-                    units="imperial"
-                )
-                
-                if result['status'] == 'OK' and result['rows'][0]['elements'][0]['status'] == 'OK':
-                    element = result['rows'][0]['elements'][0]
-                    
+                if element['status'] == 'OK':
                     duration_seconds = element['duration']['value']
                     duration_minutes = round(duration_seconds / 60)
                     
+                    # Distance value is always meters, independent of the display text
                     distance_text = element['distance']['text']
-                    # Parse distance (e.g., "5.2 mi")
-                    distance_miles = float(distance_text.split()[0]) if 'mi' in distance_text else None
+                    distance_miles = round(element['distance']['value'] * METERS_TO_MILES, 2)
                     
                     commute_data = {
                         'duration_minutes': duration_minutes,
@@ -115,23 +131,11 @@ class CommuteCalculator:
                         'meets_preference': duration_minutes < 30,
                     }
                 else:
-                    commute_data = {
-                        'duration_minutes': None,
-                        'distance_miles': None,
-                        'mode': 'transit',
-                        'meets_preference': False,
-                        'error': 'Route not found'
-                    }
+                    commute_data = self._commute_error('Route not found')
                     
             except Exception as e:
-                print(f"  Error calculating commute to {office_name}: {e}")
-                commute_data = {
-                    'duration_minutes': None,
-                    'distance_miles': None,
-                    'mode': 'transit',
-                    'meets_preference': False,
-                    'error': str(e)
-                }
+                logger.warning("Error parsing response for %s: %s", office_name, e)
+                commute_data = self._commute_error(str(e))
             
             results[office_name] = commute_data
         
@@ -139,14 +143,7 @@ class CommuteCalculator:
     
     def _get_next_weekday_morning(self) -> datetime:
         """Get next weekday at 9 AM for commute calculation"""
-        now = datetime.now()
-        next_day = now + timedelta(days=1)
-        
-        # If weekend, move to Monday
-        while next_day.weekday() >= 5:  # 5=Saturday, 6=Sunday
-            next_day += timedelta(days=1)
-        
-        return next_day.replace(hour=9, minute=0, second=0, microsecond=0)
+        return _next_weekday_morning(date.today().toordinal())
     
     def meets_commute_preference(self, commutes: Dict[str, Dict]) -> bool:
         """
@@ -158,8 +155,56 @@ class CommuteCalculator:
         Returns:
             True if any office is < 30 minutes
         """
-        return any(
-            c.get('duration_minutes', float('inf')) < 30 
-            for c in commutes.values()
-        )
+        for c in commutes.values():
+            duration = c.get('duration_minutes')
+            if duration is not None and duration < 30:
+                return True
+        return False
+
 
+class CommuteCalculator(CommuteBase):
+    """Calculate commute times to office locations"""
+    
+    def __init__(self, api_key: str):
+        """
+        Initialize commute calculator
+        
+        Args:
+            api_key: Google Maps API key
+        """
+        super().__init__(api_key)
+        # Pooled session so repeated calls reuse the TLS connection
+        self._session = requests.Session()
+        
+    def calculate_commutes(
+        self, 
+        origin: Tuple[float, float],
+        arrival_time: Optional[datetime] = None
+    ) -> Dict[str, Dict]:
+        """
+        Calculate morning commute times to all offices in one batched request
+        
+        Args:
+            origin: (latitude, longitude) of apartment
+            arrival_time: Target arrival time (default: tomorrow 9 AM)
+            
+        Returns:
+            Dictionary with commute data for each office
+        """
+        if arrival_time is None:
+            # Default to next weekday at 9 AM
+            arrival_time = self._get_next_weekday_morning()
+        
+        url = self._distance_matrix_url(
+            f"{origin[0]},{origin[1]}",
+            self._DESTINATIONS,
+            int(arrival_time.timestamp())
+        )
+        
+        try:
+            response = orjson.loads(self._session.get(url, timeout=10).content)
+        except Exception as e:
+            logger.warning("Error calculating commutes: %s", e)
+            return {office_name: self._commute_error(str(e)) for office_name in self._OFFICE_NAMES}
+        
+        return self._parse_distance_matrix(response)
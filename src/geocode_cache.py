@@ -0,0 +1,101 @@
+"""
+Persistent SQLite cache for geocoding results
+"""
+
+from typing import Dict, Optional
+import functools
+import logging
+import os
+import re
+import sqlite3
+import string
+import time
+
+logger = logging.getLogger(__name__)
+
+# Address -> coordinates is effectively immutable; expire slowly to pick up corrections
+TTL_SECONDS = 30 * 86400
+
+DB_PATH = os.getenv(
+    'GEOCODE_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'geocode.sqlite3'),
+)
+
+_PUNCTUATION = str.maketrans({c: ' ' for c in string.punctuation})
+_WHITESPACE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=1)
+def _connection() -> sqlite3.Connection:
+    """Open (and create if needed) the cache database on first use"""
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    # Shared by the event loop and worker threads; sqlite serializes writes itself
+    conn = sqlite3.connect(DB_PATH, timeout=5.0, check_same_thread=False, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS geocode ('
+        'addr TEXT PRIMARY KEY, lat REAL, lon REAL, formatted TEXT, fetched_at INTEGER)'
+    )
+    return conn
+
+
+def _normalize(address: str) -> str:
+    """Cache key for an address (case, punctuation and extra whitespace ignored)"""
+    return _WHITESPACE.sub(' ', address.strip().lower().translate(_PUNCTUATION)).strip()
+
+
+def get(address: str) -> Optional[Dict]:
+    """
+    Look up a cached geocode result
+
+    Args:
+        address: Full street address
+
+    Returns:
+        Dictionary with formatted_address/latitude/longitude, or None on a
+        miss or expired entry
+    """
+    try:
+        row = _connection().execute(
+            'SELECT lat, lon, formatted FROM geocode WHERE addr = ? AND fetched_at > ?',
+            (_normalize(address), int(time.time()) - TTL_SECONDS),
+        ).fetchone()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Geocode cache lookup failed, treating as miss: %s", e)
+        return None
+    if row is None:
+        return None
+
+    return {
+        'formatted_address': row[2],
+        'latitude': row[0],
+        'longitude': row[1],
+    }
+
+
+def put(address: str, result: Dict) -> None:
+    """
+    Cache a successful geocode result
+
+    Args:
+        address: Full street address as given by the caller
+        result: Dictionary with formatted_address, latitude and longitude
+    """
+    try:
+        _connection().execute(
+            'INSERT OR REPLACE INTO geocode (addr, lat, lon, formatted, fetched_at) VALUES (?, ?, ?, ?, ?)',
+            (
+                _normalize(address),
+                result['latitude'],
+                result['longitude'],
+                result['formatted_address'],
+                int(time.time()),
+            ),
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Geocode cache store failed, result not cached: %s", e)
+
+
+def clear() -> None:
+    """Drop all cached geocode results"""
+    _connection().execute('DELETE FROM geocode')
@@ -4,15 +4,37 @@ Main entry point for apartment address evaluator
 
 import os
 import json
-from typing import Dict
+import logging
+from typing import TYPE_CHECKING, Dict
 from datetime import datetime
 from dotenv import load_dotenv
-import googlemaps
 
+import geocode_cache
 from commute import CommuteCalculator
 from proximity import ProximityAnalyzer
 from scorer import ApartmentScorer
 
+if TYPE_CHECKING:
+    import googlemaps
+
+logger = logging.getLogger(__name__)
+
+# Load environment variables once at import
+load_dotenv()
+
+# Shared Google Maps client, created on first use
+_GMAPS = None
+
+
+def _client() -> 'googlemaps.Client':
+    """Return the process-wide Google Maps client"""
+    global _GMAPS
+    if _GMAPS is None:
+        # Only geocoding needs the SDK; importing it here keeps CLI startup lean
+        import googlemaps
+        _GMAPS = googlemaps.Client(key=os.environ['GOOGLE_MAPS_API_KEY'])
+    return _GMAPS
+
 
 def evaluate_address(address: str) -> Dict:
     """
@@ -24,42 +46,49 @@ def evaluate_address(address: str) -> Dict:
     Returns:
         Dictionary with evaluation results
     """
-    # Load environment variables
-    load_dotenv()
     google_api_key = os.getenv('GOOGLE_MAPS_API_KEY')
     
     if not google_api_key:
         raise ValueError("GOOGLE_MAPS_API_KEY not found in environment")
     
-    print(f"\n{'='*60}")
-    print(f"Evaluating Address: {address}")
-    print(f"{'='*60}\n")
+    logger.info("\n%s", "=" * 60)
+    logger.info("Evaluating Address: %s", address)
+    logger.info("%s\n", "=" * 60)
     
     # Step 1: Geocode address to get coordinates
-    print("Step 1: Geocoding address...")
+    logger.info("Step 1: Geocoding address...")
     try:
-        gmaps = googlemaps.Client(key=google_api_key)
-        geocode_result = gmaps.geocode(address)
+        geocoded = geocode_cache.get(address)
         
-        if not geocode_result:
-            print(f"❌ Could not find address: {address}")
-            return {
-                'address': address,
-                'timestamp': datetime.now().isoformat(),
-                'error': 'Address not found',
-                'score': 0.0,
+        if geocoded is None:
+            geocode_result = _client().geocode(address)
+            
+            if not geocode_result:
+                logger.error("❌ Could not find address: %s", address)
+                return {
+                    'address': address,
+                    'timestamp': datetime.now().isoformat(),
+                    'error': 'Address not found',
+                    'score': 0.0,
+                }
+            
+            location = geocode_result[0]['geometry']['location']
+            geocoded = {
+                'formatted_address': geocode_result[0]['formatted_address'],
+                'latitude': location['lat'],
+                'longitude': location['lng'],
             }
+            geocode_cache.put(address, geocoded)
         
-        location = geocode_result[0]['geometry']['location']
-        latitude = location['lat']
-        longitude = location['lng']
-        formatted_address = geocode_result[0]['formatted_address']
+        latitude = geocoded['latitude']
+        longitude = geocoded['longitude']
+        formatted_address = geocoded['formatted_address']
         
-        print(f"✓ Found: {formatted_address}")
-        print(f"  Coordinates: ({latitude}, {longitude})")
+        logger.info("✓ Found: %s", formatted_address)
+        logger.info("  Coordinates: (%s, %s)", latitude, longitude)
         
     except Exception as e:
-        print(f"❌ Error geocoding address: {e}")
+        logger.error("❌ Error geocoding address: %s", e)
         return {
             'address': address,
             'timestamp': datetime.now().isoformat(),
@@ -70,40 +99,40 @@ def evaluate_address(address: str) -> Dict:
     location_coords = (latitude, longitude)
     
     # Step 2: Calculate commutes
-    print("\nStep 2: Calculating commute times...")
+    logger.info("\nStep 2: Calculating commute times...")
     commute_calc = CommuteCalculator(google_api_key)
     commutes = commute_calc.calculate_commutes(location_coords)
     
     for office, data in commutes.items():
         duration = data.get('duration_minutes')
         if duration:
-            print(f"  {office}: {duration} minutes")
+            logger.info("  %s: %s minutes", office, duration)
         else:
-            print(f"  {office}: Unable to calculate")
+            logger.info("  %s: Unable to calculate", office)
     
     # Step 3: Find nearest subway
-    print("\nStep 3: Finding nearest subway station...")
+    logger.info("\nStep 3: Finding nearest subway station...")
     proximity = ProximityAnalyzer(google_api_key)
     subway_data = proximity.find_nearest_subway(location_coords)
     
-    if subway_data.get('station_name'):
-        print(f"  Nearest: {subway_data['station_name']} "
-              f"({subway_data.get('walk_time_minutes', 'N/A')} min walk)")
+    if subway_data.station_name:
+        logger.info("  Nearest: %s (%s min walk)",
+                    subway_data.station_name, subway_data.walk_time_minutes)
     else:
-        print(f"  Unable to find nearby subway station")
+        logger.info("  Unable to find nearby subway station")
     
     # Step 4: Analyze amenities
-    print("\nStep 4: Analyzing nearby amenities...")
+    logger.info("\nStep 4: Analyzing nearby amenities...")
     amenities_data = proximity.find_activity_areas(location_coords)
     
-    if amenities_data.get('total_amenities') is not None:
-        print(f"  Found {amenities_data['total_amenities']} amenities within walking distance")
-        print(f"  Density score: {amenities_data.get('amenity_density_score', 0):.1f}/10")
+    if amenities_data.total_amenities is not None:
+        logger.info("  Found %s amenities within walking distance", amenities_data.total_amenities)
+        logger.info("  Density score: %.1f/10", amenities_data.amenity_density_score)
     else:
-        print(f"  Unable to analyze amenities")
+        logger.info("  Unable to analyze amenities")
     
     # Step 5: Calculate score
-    print("\nStep 5: Calculating final score...")
+    logger.info("\nStep 5: Calculating final score...")
     scorer = ApartmentScorer()
     result = scorer.calculate_score(
         meets_requirements=True,  # No hard requirements for address-only evaluation
@@ -112,10 +141,10 @@ def evaluate_address(address: str) -> Dict:
         amenities_data=amenities_data
     )
     
-    print(f"\n{'='*60}")
-    print(f"FINAL SCORE: {result['score']}/5.00")
-    print(f"{'='*60}")
-    print(f"{result['explanation']}\n")
+    logger.info("\n%s", "=" * 60)
+    logger.info("FINAL SCORE: %s/5.00", result['score'])
+    logger.info("%s", "=" * 60)
+    logger.info("%s\n", result['explanation'])
     
     # Compile full result
     full_result = {
@@ -124,8 +153,8 @@ def evaluate_address(address: str) -> Dict:
         'timestamp': datetime.now().isoformat(),
         'coordinates': {'latitude': latitude, 'longitude': longitude},
         'commutes': commutes,
-        'subway': subway_data,
-        'amenities': amenities_data,
+        'subway': subway_data.to_dict(),
+        'amenities': amenities_data.to_dict(),
         'score': result['score'],
         'breakdown': result['breakdown'],
         'explanation': result['explanation'],
@@ -156,6 +185,7 @@ if __name__ == '__main__':
         sys.exit(1)
     
     address = sys.argv[1]
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'), format='%(message)s')
     
     try:
         result = evaluate_address(address)
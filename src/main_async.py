@@ -4,36 +4,80 @@ Async version of main entry point for apartment address evaluator
 
 import os
 import json
+import asyncio
+import logging
 from typing import Dict, Optional, List
 from datetime import datetime
 from dotenv import load_dotenv
-import aiohttp
+import httpx
+import orjson
 
+from src import geocode_cache
 from src.commute_async import AsyncCommuteCalculator
 from src.proximity_async import AsyncProximityAnalyzer
 from src.scorer import ApartmentScorer
 
+logger = logging.getLogger(__name__)
 
-async def geocode_address_async(address: str, api_key: str) -> Dict:
+# Resolved once at import; a missing key is reported when an evaluation runs
+# so the API server can still start (and report it via /health)
+load_dotenv()
+GOOGLE_API_KEY: Optional[str] = os.environ.get('GOOGLE_MAPS_API_KEY')
+
+
+def configure(api_key: Optional[str] = None) -> None:
+    """
+    Override settings resolved from the environment
+    
+    Args:
+        api_key: Google Maps API key to use for all evaluations
+    """
+    global GOOGLE_API_KEY
+    if api_key is not None:
+        GOOGLE_API_KEY = api_key
+
+
+def use_eager_tasks() -> None:
+    """
+    Start new tasks eagerly on the running loop so each one issues its first
+    request before the next is scheduled (Python 3.12+; no-op on older versions)
+    """
+    if hasattr(asyncio, 'eager_task_factory'):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+
+async def geocode_address_async(
+    address: str,
+    api_key: str,
+    client: Optional[httpx.AsyncClient] = None
+) -> Dict:
     """
     Geocode address using Google Maps Geocoding API (async)
     
     Args:
         address: Full street address
         api_key: Google Maps API key
+        client: Shared HTTP/2 client to reuse (optional)
         
     Returns:
         Dictionary with coordinates and formatted address
     """
+    cached = geocode_cache.get(address)
+    if cached is not None:
+        return cached
+    
     url = "https://maps.googleapis.com/maps/api/geocode/json"
     params = {
         'address': address,
         'key': api_key
     }
     
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=params) as response:
-            result = await response.json()
+    if client is None:
+        async with httpx.AsyncClient(http2=True, timeout=10.0) as own_client:
+            return await geocode_address_async(address, api_key, own_client)
+    
+    response = await client.get(url, params=params)
+    result = orjson.loads(response.content)
     
     if not result.get('results'):
         return {
@@ -44,17 +88,20 @@ async def geocode_address_async(address: str, api_key: str) -> Dict:
         }
     
     location = result['results'][0]['geometry']['location']
-    return {
+    geocoded = {
         'formatted_address': result['results'][0]['formatted_address'],
         'latitude': location['lat'],
         'longitude': location['lng']
     }
+    geocode_cache.put(address, geocoded)
+    return geocoded
 
 
 async def evaluate_address_async(
     address: str, 
     custom_offices: Optional[List[Dict]] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    http_client: Optional[httpx.AsyncClient] = None
 ) -> Dict:
     """
     Evaluate an apartment address asynchronously
@@ -62,33 +109,41 @@ async def evaluate_address_async(
     Args:
         address: Full street address (e.g., "123 Main St, Queens, NY 11101")
         custom_offices: Optional list of custom office locations
-        verbose: Whether to print progress messages
+        verbose: Whether to log progress messages
+        http_client: Shared HTTP/2 client for every Google API call (optional;
+            one is opened for this evaluation if omitted)
         
     Returns:
         Dictionary with evaluation results
     """
-    # Load environment variables
-    load_dotenv()
-    google_api_key = os.getenv('GOOGLE_MAPS_API_KEY')
-    
-    if not google_api_key:
+    if not GOOGLE_API_KEY:
         raise ValueError("GOOGLE_MAPS_API_KEY not found in environment")
     
+    if http_client is None:
+        # One HTTP/2 connection per evaluation, multiplexing every Google call
+        limits = httpx.Limits(max_keepalive_connections=8)
+        async with httpx.AsyncClient(http2=True, timeout=10.0, limits=limits) as http_client:
+            return await evaluate_address_async(
+                address, custom_offices, verbose, http_client
+            )
+    
+    google_api_key = GOOGLE_API_KEY
+    
     if verbose:
-        print(f"\n{'='*60}")
-        print(f"Evaluating Address: {address}")
-        print(f"{'='*60}\n")
+        logger.info("\n%s", "=" * 60)
+        logger.info("Evaluating Address: %s", address)
+        logger.info("%s\n", "=" * 60)
     
     # Step 1: Geocode address to get coordinates
     if verbose:
-        print("Step 1: Geocoding address...")
+        logger.info("Step 1: Geocoding address...")
     
     try:
-        geocode_result = await geocode_address_async(address, google_api_key)
+        geocode_result = await geocode_address_async(address, google_api_key, http_client)
         
         if 'error' in geocode_result:
             if verbose:
-                print(f"❌ Could not find address: {address}")
+                logger.error("❌ Could not find address: %s", address)
             return {
                 'address': address,
                 'timestamp': datetime.now().isoformat(),
@@ -101,12 +156,12 @@ async def evaluate_address_async(
         formatted_address = geocode_result['formatted_address']
         
         if verbose:
-            print(f"✓ Found: {formatted_address}")
-            print(f"  Coordinates: ({latitude}, {longitude})")
+            logger.info("✓ Found: %s", formatted_address)
+            logger.info("  Coordinates: (%s, %s)", latitude, longitude)
         
     except Exception as e:
         if verbose:
-            print(f"❌ Error geocoding address: {e}")
+            logger.error("❌ Error geocoding address: %s", e)
         return {
             'address': address,
             'timestamp': datetime.now().isoformat(),
@@ -117,54 +172,51 @@ async def evaluate_address_async(
     location_coords = (latitude, longitude)
     
     # Initialize calculators
-    commute_calc = AsyncCommuteCalculator(google_api_key)
+    commute_calc = AsyncCommuteCalculator(google_api_key, client=http_client)
     proximity = AsyncProximityAnalyzer(google_api_key)
     
     # Steps 2-4: Run commute, subway, and amenities in parallel
     if verbose:
-        print("\nStep 2-4: Calculating commutes, subway, and amenities in parallel...")
+        logger.info("\nStep 2-4: Calculating commutes, subway, and amenities in parallel...")
     
-    import asyncio
+    # Execute all async operations concurrently; each one handles its own
+    # API errors, so the group only fails on unexpected exceptions
+    async with asyncio.TaskGroup() as tg:
+        commutes_task = tg.create_task(commute_calc.calculate_commutes(location_coords))
+        amenities_task = tg.create_task(proximity.find_activity_areas(location_coords, client=http_client))
+        subway_task = tg.create_task(proximity.find_nearest_subway_async(location_coords, client=http_client))
     
-    # Execute all async operations concurrently
-    commutes_task = commute_calc.calculate_commutes(location_coords)
-    amenities_task = proximity.find_activity_areas(location_coords)
-    subway_task = proximity.find_nearest_subway_async(location_coords)
-    
-    # Wait for async tasks
-    commutes, amenities_data, subway_data = await asyncio.gather(
-        commutes_task,
-        amenities_task,
-        subway_task,
-    )
+    commutes = commutes_task.result()
+    amenities_data = amenities_task.result()
+    subway_data = subway_task.result()
     
     if verbose:
-        # Print commute results
-        print("\n  Commute times:")
+        # Log commute results
+        logger.info("\n  Commute times:")
         for office, data in commutes.items():
             duration = data.get('duration_minutes')
             if duration:
-                print(f"    {office}: {duration} minutes")
+                logger.info("    %s: %s minutes", office, duration)
             else:
-                print(f"    {office}: Unable to calculate")
+                logger.info("    %s: Unable to calculate", office)
         
-        # Print subway result
-        if subway_data.get('station_name'):
-            print(f"\n  Nearest subway: {subway_data['station_name']} "
-                  f"({subway_data.get('walk_time_minutes', 'N/A')} min walk)")
+        # Log subway result
+        if subway_data.station_name:
+            logger.info("\n  Nearest subway: %s (%s min walk)",
+                        subway_data.station_name, subway_data.walk_time_minutes)
         else:
-            print(f"\n  Unable to find nearby subway station")
+            logger.info("\n  Unable to find nearby subway station")
         
-        # Print amenities result
-        if amenities_data.get('total_amenities') is not None:
-            print(f"\n  Amenities: {amenities_data['total_amenities']} within walking distance")
-            print(f"  Density score: {amenities_data.get('amenity_density_score', 0):.1f}/10")
+        # Log amenities result
+        if amenities_data.total_amenities is not None:
+            logger.info("\n  Amenities: %s within walking distance", amenities_data.total_amenities)
+            logger.info("  Density score: %.1f/10", amenities_data.amenity_density_score)
         else:
-            print(f"\n  Unable to analyze amenities")
+            logger.info("\n  Unable to analyze amenities")
     
     # Step 5: Calculate score
     if verbose:
-        print("\nStep 5: Calculating final score...")
+        logger.info("\nStep 5: Calculating final score...")
     
     scorer = ApartmentScorer()
     result = scorer.calculate_score(
@@ -175,10 +227,10 @@ async def evaluate_address_async(
     )
     
     if verbose:
-        print(f"\n{'='*60}")
-        print(f"FINAL SCORE: {result['score']}/5.00")
-        print(f"{'='*60}")
-        print(f"{result['explanation']}\n")
+        logger.info("\n%s", "=" * 60)
+        logger.info("FINAL SCORE: %s/5.00", result['score'])
+        logger.info("%s", "=" * 60)
+        logger.info("%s\n", result['explanation'])
     
     # Compile full result
     full_result = {
@@ -187,8 +239,8 @@ async def evaluate_address_async(
         'timestamp': datetime.now().isoformat(),
         'coordinates': {'latitude': latitude, 'longitude': longitude},
         'commutes': commutes,
-        'subway': subway_data,
-        'amenities': amenities_data,
+        'subway': subway_data.to_dict(),
+        'amenities': amenities_data.to_dict(),
         'score': result['score'],
         'breakdown': result['breakdown'],
         'explanation': result['explanation'],
@@ -211,8 +263,12 @@ def save_result(result: Dict, output_dir: str = '../output'):
     print(f"Results saved to: {filepath}")
 
 
+async def _main(address: str) -> Dict:
+    use_eager_tasks()
+    return await evaluate_address_async(address)
+
+
 if __name__ == '__main__':
-    import asyncio
     import sys
     
     if len(sys.argv) < 2:
@@ -220,9 +276,20 @@ if __name__ == '__main__':
         sys.exit(1)
     
     address = sys.argv[1]
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'), format='%(message)s')
+    
+    # Run async evaluation, on uvloop when it is installed
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
     
-    # Run async evaluation
-    result = asyncio.run(evaluate_address_async(address))
+    if uvloop is not None and sys.version_info >= (3, 12):
+        result = asyncio.run(_main(address), loop_factory=uvloop.new_event_loop)
+    else:
+        if uvloop is not None:
+            uvloop.install()
+        result = asyncio.run(_main(address))
     
     # Save result
     save_result(result)
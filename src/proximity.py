@@ -2,15 +2,94 @@
 Calculate proximity to subway stations and activity areas
 """
 
+from collections import Counter
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
-from geopy.distance import geodesic
-import googlemaps
-import json
-import os
+import logging
+import numpy as np
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 
+try:
+    from src._subway_index import get_index
+except ImportError:
+    from _subway_index import get_index
 
-class ProximityAnalyzer:
-    """Analyze proximity to transit and amenities"""
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class SubwayResult:
+    """Nearest subway station lookup result"""
+    station_name: Optional[str] = None
+    distance_miles: Optional[float] = None
+    walk_time_minutes: Optional[int] = None
+    lines: Tuple[str, ...] = ()
+    meets_preference: bool = False
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict:
+        """Plain-dict form used in evaluation results ('error' only when set)"""
+        result = {
+            'station_name': self.station_name,
+            'distance_miles': self.distance_miles,
+            'walk_time_minutes': self.walk_time_minutes,
+            'lines': list(self.lines),
+            'meets_preference': self.meets_preference,
+        }
+        if self.error is not None:
+            result['error'] = self.error
+        return result
+
+
+@dataclass(slots=True, frozen=True)
+class AmenityResult:
+    """Amenity counts and density score around a location"""
+    total_amenities: Optional[int] = None
+    restaurants: int = 0
+    cafes: int = 0
+    bars: int = 0
+    bubble_tea: int = 0
+    amenity_density_score: float = 0.0
+    search_radius_miles: Optional[float] = None
+    max_walk_minutes: Optional[float] = None
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict:
+        """Plain-dict form used in evaluation results (unset optional fields omitted)"""
+        result = {
+            'total_amenities': self.total_amenities,
+            'restaurants': self.restaurants,
+            'cafes': self.cafes,
+            'bars': self.bars,
+            'bubble_tea': self.bubble_tea,
+            'amenity_density_score': self.amenity_density_score,
+        }
+        if self.search_radius_miles is not None:
+            result['search_radius_miles'] = self.search_radius_miles
+        if self.max_walk_minutes is not None:
+            result['max_walk_minutes'] = self.max_walk_minutes
+        if self.error is not None:
+            result['error'] = self.error
+        return result
+
+
+# Immutable, so the no-result cases share one instance instead of allocating per call
+NO_SUBWAY_DATA = SubwayResult(error='Subway data not available')
+NO_SUBWAY_STATION = SubwayResult()
+NO_PLACES_API = AmenityResult(error='Google Maps API not available')
+
+
+class ProximityBase:
+    """Subway proximity shared by the sync and async analyzers"""
+    
+    # Places API type -> amenity_counts bucket
+    PLACE_TYPE_CATEGORIES = {
+        'restaurant': 'restaurants',
+        'cafe': 'cafes',
+        'bar': 'bars',
+    }
     
     def __init__(self, google_api_key: Optional[str] = None):
         """
@@ -20,35 +99,12 @@ class ProximityAnalyzer:
             google_api_key: Google Maps API key for Places API
         """
         self.google_api_key = google_api_key
-        if google_api_key:
-            self.gmaps = googlemaps.Client(key=google_api_key)
-        else:
-            self.gmaps = None
-        
-        # Load subway station data
-        self.subway_stations = self._load_subway_stations()
-        
-    def _load_subway_stations(self) -> List[Dict]:
-        """Load NYC subway station data from JSON file"""
-        # Try multiple possible paths
-        possible_paths = [
-            '../data/subway_stations.json',
-            'data/subway_stations.json',
-            os.path.join(os.path.dirname(__file__), '../data/subway_stations.json'),
-        ]
-        
-        for path in possible_paths:
-            try:
-                if os.path.exists(path):
-                    with open(path, 'r') as f:
-                        return json.load(f)
-            except Exception as e:
-                continue
-        
-        print("Warning: Could not load subway station data. Using empty list.")
-        return []
-        
-    def find_nearest_subway(self, location: Tuple[float, float]) -> Dict:
+        
+        # Shared station index (loaded once per process, reused across instances)
+        self._subway_index = get_index()
+        self.subway_stations = self._subway_index
+        
+    def find_nearest_subway(self, location: Tuple[float, float]) -> SubwayResult:
         """
         Find nearest NYC subway station
         
@@ -56,50 +112,128 @@ class ProximityAnalyzer:
             location: (latitude, longitude) of apartment
             
         Returns:
-            Dictionary with nearest station info
+            SubwayResult with nearest station info
         """
         if not self.subway_stations:
-            return {
-                'station_name': None,
-                'distance_miles': None,
-                'walk_time_minutes': None,
-                'lines': [],
-                'meets_preference': False,
-                'error': 'Subway data not available'
-            }
-        
-        # Calculate distance to all stations
-        nearest_station = None
-        min_distance = float('inf')
-        
-        for station in self.subway_stations:
-            station_coords = (station['latitude'], station['longitude'])
-            distance = geodesic(location, station_coords).miles
-            
-            if distance < min_distance:
-                min_distance = distance
-                nearest_station = station
+            return NO_SUBWAY_DATA
+        
+        # Calculate distance to all stations at once
+        nearest_station, min_distance = self._subway_index.nearest(location)
         
         if nearest_station:
             walk_time = self._calculate_walk_time(min_distance)
             
-            return {
-                'station_name': nearest_station['name'],
-                'distance_miles': round(min_distance, 2),
-                'walk_time_minutes': round(walk_time),
-                'lines': nearest_station['lines'],
-                'meets_preference': walk_time < 5,  # < 5 minutes preferred
-            }
-        
-        return {
-            'station_name': None,
-            'distance_miles': None,
-            'walk_time_minutes': None,
-            'lines': [],
-            'meets_preference': False,
-        }
+            return SubwayResult(
+                station_name=nearest_station['name'],
+                distance_miles=round(min_distance, 2),
+                walk_time_minutes=round(walk_time),
+                lines=tuple(nearest_station['lines']),
+                meets_preference=walk_time < 5,  # < 5 minutes preferred
+            )
+        
+        return NO_SUBWAY_STATION
+    
+    def find_nearest_subway_batch(
+        self,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find nearest NYC subway station for many apartments at once
+        
+        Intended for batch scoring; uses the JIT-compiled kernel when numba
+        is installed. Single lookups should use find_nearest_subway.
+        
+        Args:
+            latitudes: Apartment latitudes in degrees
+            longitudes: Apartment longitudes in degrees
+            
+        Returns:
+            (indices into self.subway_stations, distances in miles)
+        """
+        return self._subway_index.nearest_batch(latitudes, longitudes)
+    
+    def _bucket_place_types(self, places: List[Dict]) -> Dict[str, int]:
+        """
+        Count places per amenity bucket from their `types` arrays
+        
+        A place tagged with several tracked types (e.g. restaurant and bar)
+        counts toward each of them.
+        
+        Args:
+            places: Places API results with a `types` list
+            
+        Returns:
+            Counts keyed by bucket name, for every bucket in PLACE_TYPE_CATEGORIES
+        """
+        type_counts = Counter(t for place in places for t in set(place.get('types') or ()))
+        return {bucket: type_counts[t] for t, bucket in self.PLACE_TYPE_CATEGORIES.items()}
+    
+    def _calculate_walk_time(self, distance_miles: float) -> float:
+        """
+        Estimate walk time in minutes
+        
+        Args:
+            distance_miles: Distance in miles
+            
+        Returns:
+            Estimated walk time in minutes (assuming 3 mph)
+        """
+        WALKING_SPEED_MPH = 3.0
+        return (distance_miles / WALKING_SPEED_MPH) * 60
+
+
+class ProximityAnalyzer(ProximityBase):
+    """Analyze proximity to transit and amenities"""
+    
+    places_url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
     
-    def find_activity_areas(self, location: Tuple[float, float], radius_miles: float = 0.5) -> Dict:
+    def __init__(self, google_api_key: Optional[str] = None):
+        """
+        Initialize proximity analyzer
+        
+        Args:
+            google_api_key: Google Maps API key for Places API
+        """
+        super().__init__(google_api_key)
+        # Plain keyed GETs need none of the googlemaps client's signing/retry layers;
+        # a pooled session keeps the TLS connection open across searches
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+    
+    def _places_nearby(
+        self,
+        location: Tuple[float, float],
+        radius: int,
+        type: Optional[str] = None,
+        keyword: Optional[str] = None,
+    ) -> Dict:
+        """
+        Run one Places Nearby Search request
+        
+        Args:
+            location: (latitude, longitude) to search around
+            radius: Search radius in meters
+            type: Optional place type filter
+            keyword: Optional keyword filter
+            
+        Returns:
+            Decoded JSON response (first page only)
+        """
+        params = {
+            'location': f"{location[0]},{location[1]}",
+            'radius': radius,
+            'key': self.google_api_key,
+        }
+        if type:
+            params['type'] = type
+        if keyword:
+            params['keyword'] = keyword
+        
+        response = self._session.get(self.places_url, params=params, timeout=5)
+        return orjson.loads(response.content)
+        
+    def find_activity_areas(self, location: Tuple[float, float], radius_miles: float = 0.5) -> AmenityResult:
         """
         Find proximity to commercial/activity areas using Google Places API
         
@@ -108,17 +242,10 @@ class ProximityAnalyzer:
             radius_miles: Search radius in miles (default: 0.5 mile walking distance)
             
         Returns:
-            Dictionary with activity area analysis
-        """
-        if not self.gmaps:
-            return {
-                'total_amenities': None,
-                'restaurants': 0,
-                'cafes': 0,
-                'bars': 0,
-                'amenity_density_score': 0.0,
-                'error': 'Google Maps API not available'
-            }
+            AmenityResult with activity area analysis
+        """
+        if not self.google_api_key:
+            return NO_PLACES_API
         
         # Convert miles to meters (Google Places API uses meters)
         radius_meters = int(radius_miles * 1609.34)
@@ -130,45 +257,24 @@ class ProximityAnalyzer:
             'bubble_tea': 0,
         }
         
-        # Search for different types of amenities
-        search_types = {
-            'restaurants': 'restaurant',
-            'cafes': 'cafe',
-            'bars': 'bar',
-        }
-        
         try:
-            for category, place_type in search_types.items():
-                result = self.gmaps.places_nearby(
-                    location=location,
-                    radius=radius_meters,
-                    type=place_type
-                )
-                
-                if result['status'] == 'OK':
-                    amenity_counts[category] = len(result.get('results', []))
+            # One restaurant search stands in for all three typed searches: most
+            # cafes and bars are also tagged 'restaurant', so bucket by types[]
+            result = self._places_nearby(location, radius_meters, type='restaurant')
+            
+            # First page only: next_page_token is deliberately never followed
+            if result['status'] == 'OK':
+                amenity_counts.update(self._bucket_place_types(result.get('results', [])))
             
             # Search for bubble tea specifically
-            bubble_tea_result = self.gmaps.places_nearby(
-                location=location,
-                radius=radius_meters,
-                keyword='bubble tea'
-            )
+            bubble_tea_result = self._places_nearby(location, radius_meters, keyword='bubble tea')
             
             if bubble_tea_result['status'] == 'OK':
                 amenity_counts['bubble_tea'] = len(bubble_tea_result.get('results', []))
             
         except Exception as e:
-            print(f"  Error searching for amenities: {e}")
-            return {
-                'total_amenities': None,
-                'restaurants': 0,
-                'cafes': 0,
-                'bars': 0,
-                'bubble_tea': 0,
-                'amenity_density_score': 0.0,
-                'error': str(e)
-            }
+            logger.warning("  Error searching for amenities: %s", e)
+            return AmenityResult(error=str(e))
         
         # Calculate total and density score
         total_amenities = sum(amenity_counts.values())
@@ -177,25 +283,12 @@ class ProximityAnalyzer:
         # 50+ amenities = 10, 0 amenities = 0
         density_score = min(10.0, (total_amenities / 50.0) * 10.0)
         
-        return {
-            'total_amenities': total_amenities,
-            'restaurants': amenity_counts['restaurants'],
-            'cafes': amenity_counts['cafes'],
-            'bars': amenity_counts['bars'],
-            'bubble_tea': amenity_counts['bubble_tea'],
-            'amenity_density_score': round(density_score, 1),
-            'search_radius_miles': radius_miles,
-        }
-    
-    def _calculate_walk_time(self, distance_miles: float) -> float:
-        """
-        Estimate walk time in minutes
-        
-        Args:
-            distance_miles: Distance in miles
-            
-        Returns:
-            Estimated walk time in minutes (assuming 3 mph)
-        """
-        WALKING_SPEED_MPH = 3.0
-        return (distance_miles / WALKING_SPEED_MPH) * 60
+        return AmenityResult(
+            total_amenities=total_amenities,
+            restaurants=amenity_counts['restaurants'],
+            cafes=amenity_counts['cafes'],
+            bars=amenity_counts['bars'],
+            bubble_tea=amenity_counts['bubble_tea'],
+            amenity_density_score=round(density_score, 1),
+            search_radius_miles=radius_miles,
+        )
@@ -3,14 +3,37 @@ Async proximity analyzer for subway stations and amenities
 """
 
 from typing import Dict, List, Optional, Tuple
-from geopy.distance import geodesic
 import asyncio
-import aiohttp
-import json
-import os
-
-
-class AsyncProximityAnalyzer:
+import logging
+import math
+import httpx
+import orjson
+
+try:
+    from src import api_cache
+    from src.proximity import (
+        NO_PLACES_API, NO_SUBWAY_DATA, NO_SUBWAY_STATION,
+        AmenityResult, ProximityBase, SubwayResult,
+    )
+except ImportError:
+    import api_cache
+    from proximity import (
+        NO_PLACES_API, NO_SUBWAY_DATA, NO_SUBWAY_STATION,
+        AmenityResult, ProximityBase, SubwayResult,
+    )
+
+logger = logging.getLogger(__name__)
+
+
+async def _settle(coro):
+    """Await a coroutine, returning its exception instead of raising it"""
+    try:
+        return await coro
+    except Exception as e:
+        return e
+
+
+class AsyncProximityAnalyzer(ProximityBase):
     """Analyze proximity to transit and amenities using async HTTP"""
     
     def __init__(self, google_api_key: Optional[str] = None):
@@ -20,83 +43,16 @@ class AsyncProximityAnalyzer:
         Args:
             google_api_key: Google Maps API key for Places API
         """
-        self.google_api_key = google_api_key
-        self.places_url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+        super().__init__(google_api_key)
+        self.places_nearby_url = "https://places.googleapis.com/v1/places:searchNearby"
+        self.places_text_url = "https://places.googleapis.com/v1/places:searchText"
         self.directions_url = "https://maps.googleapis.com/maps/api/directions/json"
         
-        # Load subway station data
-        self.subway_stations = self._load_subway_stations()
-        
-    def _load_subway_stations(self) -> List[Dict]:
-        """Load NYC subway station data from JSON file"""
-        possible_paths = [
-            '../data/subway_stations.json',
-            'data/subway_stations.json',
-            os.path.join(os.path.dirname(__file__), '../data/subway_stations.json'),
-        ]
-        
-        for path in possible_paths:
-            try:
-                if os.path.exists(path):
-                    with open(path, 'r') as f:
-                        return json.load(f)
-            except Exception:
-                continue
-        
-        print("Warning: Could not load subway station data. Using empty list.")
-        return []
-        
-    def find_nearest_subway(self, location: Tuple[float, float]) -> Dict:
-        """
-        Legacy synchronous nearest subway calculation using geodesic distance.
-        Kept for backwards compatibility; new async code should use
-        find_nearest_subway_async which leverages Google Directions for
-        walking time.
-        """
-        if not self.subway_stations:
-            return {
-                'station_name': None,
-                'distance_miles': None,
-                'walk_time_minutes': None,
-                'lines': [],
-                'meets_preference': False,
-                'error': 'Subway data not available'
-            }
-
-        nearest_station = None
-        min_distance = float('inf')
-
-        for station in self.subway_stations:
-            station_coords = (station['latitude'], station['longitude'])
-            distance = geodesic(location, station_coords).miles
-
-            if distance < min_distance:
-                min_distance = distance
-                nearest_station = station
-
-        if nearest_station:
-            walk_time = self._calculate_walk_time(min_distance)
-
-            return {
-                'station_name': nearest_station['name'],
-                'distance_miles': round(min_distance, 2),
-                'walk_time_minutes': round(walk_time),
-                'lines': nearest_station['lines'],
-                'meets_preference': walk_time < 5,
-            }
-
-        return {
-            'station_name': None,
-            'distance_miles': None,
-            'walk_time_minutes': None,
-            'lines': [],
-            'meets_preference': False,
-        }
-
     async def _get_walking_time_via_directions(
         self,
         origin: Tuple[float, float],
         destination: Tuple[float, float],
+        client: Optional[httpx.AsyncClient] = None,
     ) -> Optional[float]:
         """
         Get walking time in minutes between origin and destination using
@@ -112,13 +68,17 @@ class AsyncProximityAnalyzer:
             "key": self.google_api_key,
         }
 
+        # Reuse the caller's client when one was passed in
+        owns_client = client is None
+        if owns_client:
+            client = httpx.AsyncClient(http2=True, timeout=10.0)
+
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.directions_url, params=params) as resp:
-                    data = await resp.json()
+            resp = await client.get(self.directions_url, params=params)
+            data = orjson.loads(resp.content)
 
             if data.get("status") != "OK":
-                print(f"  Directions API error: {data.get('status')}, {data.get('error_message')}")
+                logger.warning("  Directions API error: %s, %s", data.get('status'), data.get('error_message'))
                 return None
 
             route = data["routes"][0]
@@ -127,136 +87,151 @@ class AsyncProximityAnalyzer:
             return seconds / 60.0
 
         except Exception as e:
-            print(f"  Error calling Directions API: {e}")
+            logger.warning("  Error calling Directions API: %s", e)
             return None
 
-    async def find_nearest_subway_async(self, location: Tuple[float, float]) -> Dict:
+        finally:
+            if owns_client:
+                await client.aclose()
+
+    async def find_nearest_subway_async(
+        self,
+        location: Tuple[float, float],
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> SubwayResult:
         """
         Find nearest NYC subway station and walking time using Google Directions.
-        Falls back to geodesic-based estimate if Directions API fails.
+        Falls back to haversine-based estimate if Directions API fails.
+        Pass `client` to reuse an existing HTTP/2 connection.
         """
         if not self.subway_stations:
-            return {
-                'station_name': None,
-                'distance_miles': None,
-                'walk_time_minutes': None,
-                'lines': [],
-                'meets_preference': False,
-                'error': 'Subway data not available'
-            }
+            return NO_SUBWAY_DATA
 
-        nearest_station = None
-        min_distance = float('inf')
-
-        for station in self.subway_stations:
-            station_coords = (station['latitude'], station['longitude'])
-            distance = geodesic(location, station_coords).miles
-
-            if distance < min_distance:
-                min_distance = distance
-                nearest_station = station
+        # Calculate distance to all stations at once
+        nearest_station, min_distance = self._subway_index.nearest(location)
 
         if not nearest_station:
-            return {
-                'station_name': None,
-                'distance_miles': None,
-                'walk_time_minutes': None,
-                'lines': [],
-                'meets_preference': False,
-            }
+            return NO_SUBWAY_STATION
 
         station_coords = (nearest_station['latitude'], nearest_station['longitude'])
 
-        walk_time = await self._get_walking_time_via_directions(location, station_coords)
+        walk_time = await self._get_walking_time_via_directions(location, station_coords, client)
 
         if walk_time is None:
             walk_time = self._calculate_walk_time(min_distance)
 
-        return {
-            'station_name': nearest_station['name'],
-            'distance_miles': round(min_distance, 2),
-            'walk_time_minutes': round(walk_time),
-            'lines': nearest_station['lines'],
-            'meets_preference': walk_time < 5,
-        }
+        return SubwayResult(
+            station_name=nearest_station['name'],
+            distance_miles=round(min_distance, 2),
+            walk_time_minutes=round(walk_time),
+            lines=tuple(nearest_station['lines']),
+            meets_preference=walk_time < 5,
+        )
     
     async def _fetch_places_nearby(
         self,
-        session: aiohttp.ClientSession,
+        client: httpx.AsyncClient,
         location: Tuple[float, float],
         radius_meters: int,
-        place_type: Optional[str] = None,
+        place_types: Optional[List[str]] = None,
         keyword: Optional[str] = None,
         max_results: int = 20,
         max_pages: int = 1,
     ) -> Dict:
         """
-        Fetch nearby places from Google Places API, following pagination.
+        Fetch nearby places from the Places API (v1).
+        
+        Typed lookups use places:searchNearby with every type in one
+        request; keyword lookups use places:searchText, following pagination.
         
         Args:
-            session: aiohttp client session
+            client: httpx async client
             location: (latitude, longitude) to search around
             radius_meters: Search radius in meters
-            place_type: Type of place to search for (e.g., 'restaurant')
-            keyword: Keyword to search for (e.g., 'bubble tea')
-            max_results: Max results to aggregate per category (default: 20)
-            max_pages: Max paginated responses to fetch (default: 1, i.e. single page)
+            place_types: Place types to include (e.g., ['restaurant', 'cafe'])
+            keyword: Text query to search for (e.g., 'bubble tea')
+            max_results: Max results to aggregate (default: 20, the API maximum per page)
+            max_pages: Max paginated text-search responses to fetch (default: 1)
             
         Returns:
-            Dictionary in the same shape as a single Places API response,
-            but with `results` aggregated across pages.
+            Dictionary with a legacy-style `status` ('OK', 'ZERO_RESULTS' or
+            the API error status) and the returned places under `results`.
         """
         if not self.google_api_key:
             return {"status": "NO_API_KEY", "results": []}
 
+        if keyword:
+            url = self.places_text_url
+            # searchText only accepts a rectangle restriction; use the circle's bounding box
+            lat_delta = radius_meters / 111320.0
+            lng_delta = lat_delta / math.cos(math.radians(location[0]))
+            body: Dict[str, object] = {
+                "textQuery": keyword,
+                "pageSize": min(max_results, 20),
+                "locationRestriction": {
+                    "rectangle": {
+                        "low": {"latitude": location[0] - lat_delta, "longitude": location[1] - lng_delta},
+                        "high": {"latitude": location[0] + lat_delta, "longitude": location[1] + lng_delta},
+                    }
+                },
+            }
+            # Name and types feed the bubble tea filter; nothing else is read
+            field_mask = "places.displayName,places.types"
+            if max_pages > 1:
+                field_mask += ",nextPageToken"
+        else:
+            url = self.places_nearby_url
+            body = {
+                "includedTypes": place_types or [],
+                "maxResultCount": min(max_results, 20),
+                "locationRestriction": {
+                    "circle": {
+                        "center": {"latitude": location[0], "longitude": location[1]},
+                        "radius": float(radius_meters),
+                    }
+                },
+            }
+            # Only types[] is needed to bucket the counts (searchNearby has no pagination)
+            field_mask = "places.types"
+
+        headers = {
+            "X-Goog-Api-Key": self.google_api_key,
+            "X-Goog-FieldMask": field_mask,
+        }
+
         aggregated_results: List[Dict] = []
         next_page_token: Optional[str] = None
         pages_fetched = 0
         last_status: Optional[str] = None
 
         while pages_fetched < max_pages and len(aggregated_results) < max_results:
-            params: Dict[str, object] = {
-                "key": self.google_api_key,
-            }
-
             if next_page_token:
-                params["pagetoken"] = next_page_token
-            else:
-                params.update(
-                    {
-                        "location": f"{location[0]},{location[1]}",
-                        "radius": radius_meters,
-                    }
-                )
-                if place_type:
-                    params["type"] = place_type
-                if keyword:
-                    params["keyword"] = keyword
-
-            async with session.get(self.places_url, params=params) as response:
-                data = await response.json()
-
-            status = data.get("status")
-            last_status = status
-
-            if status != "OK":
-                # ZERO_RESULTS just means nothing found; anything else we log and stop.
-                if status not in ("ZERO_RESULTS", "OK"):
-                    print(f"  Places API error ({place_type or keyword}): {status} {data.get('error_message')}")
+                body = {**body, "pageToken": next_page_token}
+
+            data = await api_cache.cached_post(client, url, body, headers)
+
+            if "error" in data:
+                error = data["error"]
+                last_status = error.get("status") or "ERROR"
+                logger.warning("  Places API error (%s): %s %s",
+                               keyword or ','.join(place_types or []), last_status, error.get('message'))
+                break
+
+            page_results = data.get("places", [])
+            if not page_results:
+                last_status = last_status or "ZERO_RESULTS"
                 break
 
-            page_results = data.get("results", [])
+            last_status = "OK"
             aggregated_results.extend(page_results)
 
-            next_page_token = data.get("next_page_token")
             pages_fetched += 1
+            # Never follow a page token beyond the requested page budget
+            next_page_token = data.get("nextPageToken") if pages_fetched < max_pages else None
 
             if not next_page_token or len(aggregated_results) >= max_results:
                 break
 
-            # Google docs require a short delay before using next_page_token
-            await asyncio.sleep(2.0)
-
         # Truncate to max_results in case we went slightly over
         aggregated_results = aggregated_results[:max_results]
 
@@ -265,27 +240,25 @@ class AsyncProximityAnalyzer:
             "results": aggregated_results,
         }
     
-    async def find_activity_areas(self, location: Tuple[float, float], max_walk_minutes: float =20.0) -> Dict:
+    async def find_activity_areas(
+        self,
+        location: Tuple[float, float],
+        max_walk_minutes: float = 20.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> AmenityResult:
         """
         Find proximity to commercial/activity areas using Google Places API (async)
         
         Args:
             location: (latitude, longitude) of apartment
             max_walk_minutes: Walking time budget in minutes (default: 10 minutes)
+            client: Shared HTTP/2 client to reuse (optional)
             
         Returns:
             Dictionary with activity area analysis
         """
         if not self.google_api_key:
-            return {
-                'total_amenities': None,
-                'restaurants': 0,
-                'cafes': 0,
-                'bars': 0,
-                'bubble_tea': 0,
-                'amenity_density_score': 0.0,
-                'error': 'Google Maps API not available'
-            }
+            return NO_PLACES_API
         
         # Convert walking time budget to distance radius in meters
         WALKING_SPEED_MPH = 3.0
@@ -299,49 +272,60 @@ class AsyncProximityAnalyzer:
             'bubble_tea': 0,
         }
         
-        # Define search tasks
-        search_configs = [
-            {'place_type': 'restaurant', 'category': 'restaurants'},
-            {'place_type': 'cafe', 'category': 'cafes'},
-            {'place_type': 'bar', 'category': 'bars'},
-            {'keyword': 'bubble tea', 'category': 'bubble_tea'},
-        ]
+        # Reuse the caller's client when one was passed in; both searches
+        # below are multiplexed over a single HTTP/2 connection
+        owns_client = client is None
+        if owns_client:
+            client = httpx.AsyncClient(
+                http2=True,
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=8),
+            )
         
         try:
-            async with aiohttp.ClientSession() as session:
-                tasks = []
-                categories = []
-                
-                for config in search_configs:
-                    task = self._fetch_places_nearby(
-                        session,
-                        location,
-                        radius_meters,
-                        place_type=config.get('place_type'),
-                        keyword=config.get('keyword')
-                    )
-                    tasks.append(task)
-                    categories.append(config['category'])
-                
-                # Execute all API calls in parallel
-                responses = await asyncio.gather(*tasks, return_exceptions=True)
+            search_tasks = {
+                # One searchNearby call covers restaurants, cafes and bars
+                'typed': self._fetch_places_nearby(
+                    client,
+                    location,
+                    radius_meters,
+                    place_types=list(self.PLACE_TYPE_CATEGORIES),
+                ),
+                'bubble_tea': self._fetch_places_nearby(
+                    client,
+                    location,
+                    radius_meters,
+                    keyword='bubble tea',
+                ),
+            }
+            categories = list(search_tasks)
+            
+            # Execute all API calls in parallel; a failed search is reported
+            # per category instead of cancelling the other one
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(_settle(coro)) for coro in search_tasks.values()]
+            responses = [task.result() for task in tasks]
             
             # Process results
             for category, response in zip(categories, responses):
                 if isinstance(response, Exception):
-                    print(f"  Error searching for {category}: {response}")
+                    logger.warning("  Error searching for %s: %s", category, response)
                     continue
                 
                 if response.get('status') == 'OK':
                     results = response.get('results', [])
 
+                    if category == 'typed':
+                        amenity_counts.update(self._bucket_place_types(results))
+                        continue
+
                     # For bubble tea, be stricter but still practical:
                     # only count places that look like actual bubble tea
                     # / tea shops (not wholesale supply stores).
                     if category == 'bubble_tea':
                         filtered = []
                         for place in results:
-                            name = (place.get('name') or '').lower()
+                            name = ((place.get('displayName') or {}).get('text') or '').lower()
                             types_list = place.get('types') or []
                             types_str = ' '.join(types_list).lower()
                             
@@ -387,23 +371,21 @@ class AsyncProximityAnalyzer:
 
                         # Debug logging to inspect which bubble tea places
                         # are being counted within the current walk radius.
-                        print(f"Bubble tea places within ~{max_walk_minutes} min radius (count={len(results)}):")
+                        logger.debug("Bubble tea places within ~%s min radius (count=%d):",
+                                     max_walk_minutes, len(results))
                         for p in results:
-                            print("  -", p.get('name'), "| types:", p.get('types'))
+                            logger.debug("  - %s | types: %s",
+                                         (p.get('displayName') or {}).get('text'), p.get('types'))
 
                     amenity_counts[category] = len(results)
             
         except Exception as e:
-            print(f"  Error searching for amenities: {e}")
-            return {
-                'total_amenities': None,
-                'restaurants': 0,
-                'cafes': 0,
-                'bars': 0,
-                'bubble_tea': 0,
-                'amenity_density_score': 0.0,
-                'error': str(e)
-            }
+            logger.warning("  Error searching for amenities: %s", e)
+            return AmenityResult(error=str(e))
+        
+        finally:
+            if owns_client:
+                await client.aclose()
         
         # Calculate total and density score
         total_amenities = sum(amenity_counts.values())
@@ -412,26 +394,13 @@ class AsyncProximityAnalyzer:
         # 50+ amenities = 10, 0 amenities = 0
         density_score = min(10.0, (total_amenities / 50.0) * 10.0)
         
-        return {
-            'total_amenities': total_amenities,
-            'restaurants': amenity_counts['restaurants'],
-            'cafes': amenity_counts['cafes'],
-            'bars': amenity_counts['bars'],
-            'bubble_tea': amenity_counts['bubble_tea'],
-            'amenity_density_score': round(density_score, 1),
-            'search_radius_miles': radius_miles,
-            'max_walk_minutes': max_walk_minutes,
-        }
-    
-    def _calculate_walk_time(self, distance_miles: float) -> float:
-        """
-        Estimate walk time in minutes
-        
-        Args:
-            distance_miles: Distance in miles
-            
-        Returns:
-            Estimated walk time in minutes (assuming 3 mph)
-        """
-        WALKING_SPEED_MPH = 3.0
-        return (distance_miles / WALKING_SPEED_MPH) * 60
+        return AmenityResult(
+            total_amenities=total_amenities,
+            restaurants=amenity_counts['restaurants'],
+            cafes=amenity_counts['cafes'],
+            bars=amenity_counts['bars'],
+            bubble_tea=amenity_counts['bubble_tea'],
+            amenity_density_score=round(density_score, 1),
+            search_radius_miles=radius_miles,
+            max_walk_minutes=max_walk_minutes,
+        )
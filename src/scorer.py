@@ -2,7 +2,18 @@
 Score apartment listings based on all criteria
 """
 
-from typing import Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.proximity import AmenityResult, SubwayResult
+
+
+def _field(data: Union[Dict, Any], name: str, default=None):
+    """Read a field from either a result dict or a result dataclass"""
+    if isinstance(data, dict):
+        return data.get(name, default)
+    return getattr(data, name, default)
 
 
 class ApartmentScorer:
@@ -32,8 +43,8 @@ class ApartmentScorer:
         self,
         meets_requirements: bool,
         commutes: Dict[str, Dict],
-        subway_data: Dict,
-        amenities_data: Dict
+        subway_data: Union[Dict, 'SubwayResult'],
+        amenities_data: Union[Dict, 'AmenityResult']
     ) -> Dict:
         """
         Calculate overall score out of 5.00
@@ -59,8 +70,16 @@ class ApartmentScorer:
                 'explanation': 'Does not meet basic requirements'
             }
         
+        # One pass over the offices; both commute checks only need the extremes
+        durations = [
+            d for d in (c.get('duration_minutes') for c in commutes.values())
+            if d is not None
+        ]
+        min_commute = min(durations, default=None)
+        max_commute = max(durations, default=None)
+        
         # Calculate component scores (0-5 scale)
-        commute_score = self._score_commute(commutes)
+        commute_score = self._score_commute(min_commute, max_commute)
         subway_score = self._score_subway_proximity(subway_data)
         amenities_score = self._score_amenities(amenities_data)
         
@@ -76,7 +95,7 @@ class ApartmentScorer:
         
         # Add bonus for meeting all preferences
         bonus = 0.0
-        if self._meets_all_preferences(commutes, subway_data):
+        if self._meets_all_preferences(max_commute, _field(subway_data, 'walk_time_minutes')):
             bonus = 5.0 * self.weights['requirements_bonus']
         
         final_score = min(5.0, base_total + bonus)
@@ -95,26 +114,93 @@ class ApartmentScorer:
             )
         }
     
-    def _score_commute(self, commutes: Dict[str, Dict]) -> float:
-        """Score commute times (0-5 scale)"""
-        # Find best (shortest) commute, filtering out None values
-        valid_commutes = [
-            c.get('duration_minutes') 
-            for c in commutes.values() 
-            if c.get('duration_minutes') is not None
-        ]
+    def calculate_scores_batch(
+        self,
+        min_commute: np.ndarray,
+        max_commute: np.ndarray,
+        subway_walk: np.ndarray,
+        density: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate final scores for many listings at once
+        
+        Same formula as calculate_score for listings that meet requirements.
+        Missing values are passed as NaN.
+        
+        Args:
+            min_commute: Shortest commute per listing in minutes
+            max_commute: Longest commute per listing in minutes
+            subway_walk: Walk time to nearest subway per listing in minutes
+            density: Amenity density score (0-10) per listing
+            
+        Returns:
+            Array of final scores (0-5), rounded to 2 decimals
+        """
+        min_commute = np.asarray(min_commute, dtype=np.float64)
+        max_commute = np.asarray(max_commute, dtype=np.float64)
+        subway_walk = np.asarray(subway_walk, dtype=np.float64)
+        
+        components = np.stack([
+            self.score_commute_batch(min_commute, max_commute),
+            self.score_subway_batch(subway_walk),
+            self.score_amenities_batch(density),
+        ])
+        weights = np.array([
+            self.weights['commute'],
+            self.weights['subway_proximity'],
+            self.weights['amenities'],
+        ])
+        base_total = (weights @ components) / (1.0 - self.weights['requirements_bonus'])
         
-        if not valid_commutes:
+        # NaN compares False, so missing data never earns the bonus
+        meets_all = (max_commute < 30) & (subway_walk < 5)
+        bonus = np.where(meets_all, 5.0 * self.weights['requirements_bonus'], 0.0)
+        
+        return np.round(np.minimum(5.0, base_total + bonus), 2)
+    
+    @staticmethod
+    def score_commute_batch(min_commute: np.ndarray, max_commute: np.ndarray) -> np.ndarray:
+        """Vectorized _score_commute over per-listing best/worst commute minutes"""
+        m = np.asarray(min_commute, dtype=np.float64)
+        worst = np.asarray(max_commute, dtype=np.float64)
+        
+        base = np.select(
+            [m < 20, m < 30, m < 45],
+            [5.0, 4.0 - (m - 20) / 10, 3.0 - ((m - 30) / 15) * 2.0],
+            default=np.maximum(0.0, 1.0 - (m - 45) / 30),
+        )
+        # 5/5 only if every office is under 30 minutes; otherwise capped at 4.0
+        scores = np.where(worst < 30, 5.0, np.minimum(4.0, base))
+        return np.where(np.isnan(m), 0.0, scores)
+    
+    @staticmethod
+    def score_subway_batch(walk_minutes: np.ndarray) -> np.ndarray:
+        """Vectorized _score_subway_proximity over walk times in minutes"""
+        w = np.asarray(walk_minutes, dtype=np.float64)
+        
+        scores = np.select(
+            [w < 5, w < 10, w < 15],
+            [5.0, 4.0 - ((w - 5) / 5) * 1.5, 2.5 - ((w - 10) / 5) * 1.5],
+            default=np.maximum(0.0, 1.0 - (w - 15) / 10),
+        )
+        return np.where(np.isnan(w), 0.0, scores)
+    
+    @staticmethod
+    def score_amenities_batch(density: np.ndarray) -> np.ndarray:
+        """Vectorized _score_amenities over 0-10 density scores"""
+        d = np.asarray(density, dtype=np.float64)
+        return np.where(np.isnan(d), 0.0, (d / 10.0) * 5.0)
+    
+    def _score_commute(self, min_commute: Optional[float], max_commute: Optional[float]) -> float:
+        """Score commute times (0-5 scale) from the best and worst office commute"""
+        if max_commute is None:
             return 0.0
         
         # Strict requirement: 5/5 only if ALL offices are < 30 mins
-        max_commute = max(valid_commutes)
         if max_commute < 30:
             return 5.0
             
         # Otherwise score based on best commute, but cap at 4.0
-        min_commute = min(valid_commutes)
-        
         # Scoring: 5.0 for <20 min, 4.0 for 20-30, decreasing after 30
         if min_commute < 20:
             base_score = 5.0
@@ -127,9 +213,9 @@ class ApartmentScorer:
             
         return min(4.0, base_score)
     
-    def _score_subway_proximity(self, subway_data: Dict) -> float:
+    def _score_subway_proximity(self, subway_data: Union[Dict, 'SubwayResult']) -> float:
         """Score subway proximity (0-5 scale)"""
-        walk_time = subway_data.get('walk_time_minutes')
+        walk_time = _field(subway_data, 'walk_time_minutes')
         
         # Handle None or missing walk time
         if walk_time is None:
@@ -145,9 +231,9 @@ class ApartmentScorer:
         else:
             return max(0.0, 1.0 - ((walk_time - 15) / 10))
     
-    def _score_amenities(self, amenities_data: Dict) -> float:
+    def _score_amenities(self, amenities_data: Union[Dict, 'AmenityResult']) -> float:
         """Score amenity proximity (0-5 scale)"""
-        density_score = amenities_data.get('amenity_density_score', 0.0)
+        density_score = _field(amenities_data, 'amenity_density_score', 0.0)
         
         # Handle None density score
         if density_score is None:
@@ -161,28 +247,15 @@ class ApartmentScorer:
     
     def _meets_all_preferences(
         self, 
-        commutes: Dict[str, Dict], 
-        subway_data: Dict
+        max_commute: Optional[float], 
+        subway_walk: Optional[float]
     ) -> bool:
         """Check if listing meets all preferences"""
-        # Filter out None values from commute times
-        valid_commutes = [
-            c.get('duration_minutes')
-            for c in commutes.values()
-            if c.get('duration_minutes') is not None
-        ]
-        
-        if not valid_commutes:
-            return False
-        
-        worst_commute = max(valid_commutes)
-        subway_walk = subway_data.get('walk_time_minutes')
-        
-        # Check if both preferences are met
-        if subway_walk is None:
+        # Missing commute or subway data never meets the preferences
+        if max_commute is None or subway_walk is None:
             return False
             
-        return worst_commute < 30 and subway_walk < 5
+        return max_commute < 30 and subway_walk < 5
     
     def _generate_explanation(
         self, 
@@ -3,31 +3,354 @@ StreetEasy listing scraper module
 Extracts apartment details from StreetEasy URLs
 """
 
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict, deque
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import threading
+import diskcache
+import orjson
 import requests
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, Page
-from playwright_stealth import stealth_sync
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, Tag
+from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright, BrowserContext
+from playwright_stealth import stealth_async, stealth_sync
 import re
 import json
 import time
 import random
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to substring checks
+    ahocorasick = None
+
+if TYPE_CHECKING:
+    import aiohttp
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Parsing is deterministic in (html, url), so re-scraping an unchanged page
+# skips BeautifulSoup and the extractors; in memory first, then on disk
+PARSE_CACHE_MAX_ENTRIES = 512
+PARSE_CACHE_TTL_SECONDS = 7 * 86400
+# Bump whenever extraction logic changes so older on-disk parses are ignored
+PARSE_CACHE_VERSION = 5
+PARSE_CACHE_DIR = os.getenv(
+    'SCRAPE_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'scrape'),
+)
+
+# Maps (HTML digest, url) -> parsed listing, least to most recently used.
+# Guarded by a lock because scrape_listings parses in worker threads.
+_parse_cache: "OrderedDict[Tuple[bytes, str], Dict]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_store() -> diskcache.Cache:
+    """Open the on-disk parse cache on first use"""
+    return diskcache.Cache(PARSE_CACHE_DIR)
+
+# Concurrent fetches in scrape_listings; StreetEasy throttles aggressive clients
+MAX_CONCURRENT_FETCHES = 10
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Shared by the sync browser and PlaywrightPool. Headless by default; stealth
+# scripts are only added once StreetEasy pushes back (see _looks_blocked)
+LAUNCH_OPTIONS = {
+    'headless': True,
+    'args': [
+        '--disable-blink-features=AutomationControlled',
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-gpu',
+        '--blink-settings=imagesEnabled=false',
+    ],
+}
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': USER_AGENT,
+}
+
+# The structured listing data Playwright waits for before reading the page
+NEXT_DATA_SELECTOR = 'script#__NEXT_DATA__'
+
+# Readiness comes from waiting on NEXT_DATA_SELECTOR; this is only anti-bot jitter
+JITTER_SECONDS = (0.1, 0.4)
+
+# __NEXT_DATA__ is inline in the initial HTML, so assets and trackers are pure overhead
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media', 'stylesheet'})
+_BLOCKED_URL_PARTS = ('google-analytics', 'doubleclick', 'segment.io', 'hotjar')
+
+
+def _should_block(request) -> bool:
+    """Whether a browser request can be aborted without affecting parsing"""
+    return request.resource_type in _BLOCKED_RESOURCE_TYPES or \
+        any(part in request.url for part in _BLOCKED_URL_PARTS)
+
+
+def _looks_blocked(response, title: str) -> bool:
+    """Whether a page load hit a bot check (HTTP 403 or an "Access denied" page)"""
+    return (response is not None and response.status == 403) or 'access denied' in title.lower()
+
+
+def _route_sync(route):
+    """Route handler for the sync browser context"""
+    if _should_block(route.request):
+        route.abort()
+    else:
+        route.continue_()
+
+
+async def _route_async(route):
+    """Route handler for PlaywrightPool contexts"""
+    if _should_block(route.request):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Text patterns for the HTML fallback extractors, compiled once
+_ROOMS_BEDS_RE = re.compile(r'(\d+)\s+rooms?\s*[|\s]\s*(\d+)\s+beds?', re.IGNORECASE)
+_BEDS_RE = re.compile(r'(\d+)\s+beds?(?:\s|[|\r\n]|$)', re.IGNORECASE)
+_STUDIO_RE = re.compile(r'\bstudio\b', re.IGNORECASE)
+_BATHS_RE = re.compile(r'([\d.]+)\s+baths?(?:\s|[|\r\n]|$)', re.IGNORECASE)
+_PRICE_RE = re.compile(r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:FOR\s+)?RENT', re.IGNORECASE)
+# Only amounts that can land in $500-$50,000: three digits, or one comma group
+# after one or two digits. The lookahead rejects longer amounts ("$5000",
+# "$12,3456", "$1,200,000") instead of matching their leading digits, while a
+# plain comma after the amount ("$1,200, utilities included") still matches
+_PRICE_FALLBACK_RE = re.compile(r'\$(\d{3}|\d{1,2},\d{3})(?!\d|,\d)')
+_LAT_RE = re.compile(r'latitude["\']?\s*:\s*([-\d.]+)')
+_LON_RE = re.compile(r'longitude["\']?\s*:\s*([-\d.]+)')
+_AMENITY_CLASS_RE = re.compile('amenity|feature', re.IGNORECASE)
+_PET_CLASS_RE = re.compile('pet|policy', re.IGNORECASE)
+# Union of the two, so both section lists come from a single find_all
+_SECTION_CLASS_RE = re.compile('amenity|feature|pet|policy', re.IGNORECASE)
+
+
+# Phrases searched in lowercased page text by the laundry/pet extractors
+_IN_UNIT_LAUNDRY = frozenset({
+    'in-unit laundry', 'in unit laundry', 'washer/dryer in unit',
+    'washer and dryer in unit', 'w/d in unit', 'laundry in unit',
+})
+_IN_BUILDING_LAUNDRY = frozenset({
+    'laundry in building', 'building laundry', 'common laundry',
+    'shared laundry', 'laundry room', 'laundry facilities',
+})
+_CATS_OK = frozenset({'cats allowed', 'cats ok', 'cat friendly'})
+_PETS_OK = frozenset({'pets allowed', 'pets ok', 'pet friendly', 'dogs and cats'})
+_NO_CATS = frozenset({'no cats', 'cats not allowed'})
+_NO_PETS = frozenset({'no pets', 'pets not allowed', 'no dogs or cats'})
+
+# __NEXT_DATA__ amenity codes and name phrases for laundry
+_IN_UNIT_CODES = frozenset({'15', 'WASHER_DRYER'})
+_IN_BUILDING_CODES = frozenset({'16', 'LAUNDRY_IN_BUILDING'})
+_AMENITY_LAUNDRY_PHRASES = (
+    ('in-unit laundry', 'in_unit'),
+    ('washer/dryer in unit', 'in_unit'),
+    ('washer dryer', 'in_unit'),
+    ('laundry in building', 'in_building'),
+    ('laundry room', 'in_building'),
+    ('common laundry', 'in_building'),
+)
+
+# Listing fields whose HTML extractors consume the phrase hits
+_PHRASE_FIELDS = frozenset({'laundry', 'cats_allowed', 'pets_allowed'})
+
+
+class _PhraseMatcher:
+    """Report which of a fixed set of phrases occur in a text"""
+    
+    def __init__(self, phrases: frozenset):
+        self.phrases = phrases
+        self._automaton = None
+        if ahocorasick is not None:
+            # One automaton sweep finds every phrase, overlapping ones included
+            self._automaton = ahocorasick.Automaton()
+            for phrase in phrases:
+                self._automaton.add_word(phrase, phrase)
+            self._automaton.make_automaton()
+    
+    def find(self, text: str) -> frozenset:
+        """Return the subset of phrases contained in text"""
+        if self._automaton is not None:
+            return frozenset(phrase for _, phrase in self._automaton.iter(text))
+        return frozenset(phrase for phrase in self.phrases if phrase in text)
+
+
+_PHRASE_MATCHER = _PhraseMatcher(
+    _IN_UNIT_LAUNDRY | _IN_BUILDING_LAUNDRY | _CATS_OK | _PETS_OK | _NO_CATS | _NO_PETS
+)
+
+
+# Keys that hold the listing record inside __NEXT_DATA__, in priority order
+_LISTING_KEYS = ('listing', 'listingData', 'property')
+
+
+def _find_keys(obj: Any, targets: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Find the shallowest non-None value for each target key in a JSON tree
+
+    Walks dicts and lists breadth-first with an explicit queue and stops as
+    soon as every target has been found.
+
+    Args:
+        obj: Decoded JSON document
+        targets: Keys to look for
+
+    Returns:
+        Dictionary of target key -> value for the keys that were found
+    """
+    found: Dict[str, Any] = {}
+    queue = deque([obj])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in targets and key not in found and value is not None:
+                    found[key] = value
+                    if len(found) == len(targets):
+                        return found
+                if isinstance(value, (dict, list)):
+                    queue.append(value)
+        elif isinstance(node, list):
+            queue.extend(item for item in node if isinstance(item, (dict, list)))
+    return found
+
+
+def _next_data_blob(raw: bytes) -> Optional[bytes]:
+    """
+    Slice the __NEXT_DATA__ JSON out of raw page bytes without parsing the HTML
+
+    Returns:
+        The script body, or None if the tag is not found
+    """
+    marker = raw.find(b'id="__NEXT_DATA__"')
+    if marker < 0:
+        return None
+    # The id must be an attribute of an open <script ...> tag, not page text
+    tag_open = raw.rfind(b'<script', 0, marker)
+    if tag_open < 0 or raw.rfind(b'>', tag_open, marker) >= 0:
+        return None
+    start = raw.find(b'>', marker) + 1
+    end = raw.find(b'</script>', start)
+    if start == 0 or end < 0:
+        return None
+    return raw[start:end]
+
+
+def _loads_json(text: Union[bytes, str]) -> Any:
+    """Decode an embedded JSON blob with orjson, falling back to json for input it rejects (e.g. NaN)"""
+    # No sys.intern pass over the keys: orjson's key cache and json's scanner
+    # memo already hand back one str object per repeated key, and a rebuild
+    # (or object_hook, which orjson lacks) would cost more than it saves
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+class PlaywrightPool:
+    """Pre-warmed pool of browser contexts for concurrent Playwright scraping"""
+    
+    def __init__(self, size: int = 4, stealth: bool = False):
+        """
+        Initialize pool (call start() or use as an async context manager)
+        
+        Args:
+            size: Number of browser contexts, i.e. concurrent page loads
+            stealth: Apply stealth to every page up front instead of only
+                when a page load hits a bot check
+        """
+        self.size = size
+        self.stealth = stealth
+        self.playwright = None
+        self.browser = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._used = set()
+        self.metrics = {'created': 0, 'reused': 0, 'active': 0}
+    
+    async def start(self):
+        """Launch one browser and open every context up front"""
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(**LAUNCH_OPTIONS)
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            context = await self.browser.new_context(**CONTEXT_OPTIONS)
+            await context.route('**/*', _route_async)
+            self._idle.put_nowait(context)
+            self.metrics['created'] += 1
+        logger.info("Playwright pool started with %d contexts", self.size)
+    
+    async def acquire(self) -> BrowserContext:
+        """Wait for an idle context and lease it"""
+        context = await self._idle.get()
+        if context in self._used:
+            self.metrics['reused'] += 1
+        self._used.add(context)
+        self.metrics['active'] += 1
+        return context
+    
+    def release(self, context: BrowserContext):
+        """Return a leased context to the pool"""
+        self.metrics['active'] -= 1
+        self._idle.put_nowait(context)
+    
+    async def close(self):
+        """Close all contexts, the browser and Playwright"""
+        if self._idle:
+            while not self._idle.empty():
+                await self._idle.get_nowait().close()
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        logger.info("Playwright pool closed (metrics: %s)", self.metrics)
+    
+    async def __aenter__(self):
+        """Async context manager support"""
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager cleanup"""
+        await self.close()
+
 
 class StreetEasyScraper:
     """Scrapes apartment listing data from StreetEasy"""
     
-    def __init__(self, use_playwright: bool = True):
+    def __init__(self, use_playwright: bool = True, stealth_mode: bool = False):
         """
         Initialize scraper
         
         Args:
             use_playwright: Use Playwright for JavaScript-heavy pages (recommended)
+            stealth_mode: Apply stealth to the page from the start; otherwise it
+                is switched on the first time a page load hits a bot check
         """
         self.use_playwright = use_playwright
+        self.stealth_mode = stealth_mode
         self.playwright = None
         self.browser = None
         self.context = None
+        self._page: Optional[Page] = None
+        
+        # Pooled session for the requests path: listings share one TLS connection
+        self._session = requests.Session()
+        self._session.headers.update({'User-Agent': USER_AGENT})
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+        self._session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
         
         # Initialize browser if using Playwright
         if self.use_playwright:
@@ -39,28 +362,34 @@ class StreetEasyScraper:
             from playwright.sync_api import sync_playwright
             
             self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(
-                headless=False,
-                args=['--disable-blink-features=AutomationControlled']
-            )
-            self.context = self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            print("Browser initialized successfully")
+            self.browser = self.playwright.chromium.launch(**LAUNCH_OPTIONS)
+            self.context = self.browser.new_context(**CONTEXT_OPTIONS)
+            self.context.route('**/*', _route_sync)
+            self._page = self._new_page()
+            logger.info("Browser initialized successfully")
         except Exception as e:
-            print(f"Failed to initialize browser: {e}")
+            logger.warning("Failed to initialize browser: %s", e)
             self.use_playwright = False
     
+    def _new_page(self) -> Page:
+        """Open the page reused for every listing (stealth applied once, if enabled)"""
+        page = self.context.new_page()
+        if self.stealth_mode:
+            stealth_sync(page)
+        return page
+    
     def close(self):
         """Close browser and cleanup resources"""
+        if self._page and not self._page.is_closed():
+            self._page.close()
         if self.context:
             self.context.close()
         if self.browser:
             self.browser.close()
         if self.playwright:
             self.playwright.stop()
-        print("Browser closed")
+        self._session.close()
+        logger.info("Browser closed")
     
     def __enter__(self):
         """Context manager support"""
@@ -85,125 +414,293 @@ class StreetEasyScraper:
         else:
             return self._scrape_with_requests(url)
     
+    async def scrape_listings(self, urls: List[str], pool: Optional[PlaywrightPool] = None) -> List[Dict]:
+        """
+        Scrape many listings concurrently
+        
+        Without a pool, pages are fetched with aiohttp (no JavaScript
+        rendering). With a started PlaywrightPool, pages are rendered in
+        pooled browser contexts and fall back to aiohttp on failure. Parsing
+        runs in worker threads so it never blocks the event loop.
+        
+        Args:
+            urls: StreetEasy listing URLs
+            pool: Optional PlaywrightPool for JavaScript-heavy pages
+            
+        Returns:
+            Listing dictionaries in the same order as urls
+        """
+        # Only batch scraping needs aiohttp; importing it here keeps scraper import lean
+        import aiohttp
+        
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        connector = aiohttp.TCPConnector(limit=20, limit_per_host=6, ttl_dns_cache=300, keepalive_timeout=60)
+        
+        # The session only serves _fetch_one, so its per-request timeout lives here
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=15),
+        ) as session:
+            if pool is None:
+                tasks = (self._fetch_one(session, semaphore, url) for url in urls)
+            else:
+                tasks = (self._render_one(pool, session, semaphore, url) for url in urls)
+            return await asyncio.gather(*tasks)
+    
+    async def _render_one(
+        self,
+        pool: PlaywrightPool,
+        session: 'aiohttp.ClientSession',
+        semaphore: asyncio.Semaphore,
+        url: str
+    ) -> Dict:
+        """Render one listing in a pooled context, falling back to _fetch_one"""
+        try:
+            context = await pool.acquire()
+            try:
+                page = await context.new_page()
+                try:
+                    if pool.stealth:
+                        await stealth_async(page)
+                    logger.info("Loading page: %s", url)
+                    response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                    if not pool.stealth and _looks_blocked(response, await page.title()):
+                        logger.info("Bot check on %s, retrying with stealth", url)
+                        await stealth_async(page)
+                        await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                    try:
+                        await page.wait_for_selector(NEXT_DATA_SELECTOR, state='attached', timeout=8000)
+                    except PlaywrightTimeoutError:
+                        logger.debug("__NEXT_DATA__ did not appear, parsing page as loaded")
+                    
+                    # Short jitter so requests don't arrive in lockstep
+                    await asyncio.sleep(random.uniform(*JITTER_SECONDS))
+                    
+                    html = await page.content()
+                finally:
+                    await page.close()
+            finally:
+                pool.release(context)
+            
+            return await asyncio.to_thread(self._parse_html, html, url)
+            
+        except Exception as e:
+            logger.warning("Error scraping %s with Playwright pool, falling back to aiohttp: %s", url, e)
+            return await self._fetch_one(session, semaphore, url)
+    
+    async def _fetch_one(self, session: 'aiohttp.ClientSession', semaphore: asyncio.Semaphore, url: str) -> Dict:
+        """Fetch and parse one listing for scrape_listings"""
+        try:
+            async with semaphore:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    html = await response.read()
+            
+            return await asyncio.to_thread(self._parse_html, html, url)
+            
+        except Exception as e:
+            logger.error("Error scraping %s with aiohttp: %s", url, e)
+            return self._get_empty_listing_data(url)
+    
+    def _parse_page(self, html: Union[bytes, str], raw: bytes, url: str) -> Dict:
+        """Parse a page, skipping the BeautifulSoup build when __NEXT_DATA__ is complete"""
+        blob = _next_data_blob(raw)
+        next_data = self._listing_from_next_data(blob) if blob else None
+        if next_data:
+            listing = {**self._get_empty_listing_data(url), **next_data}
+            if all(value is not None for value in listing.values()):
+                logger.debug("Found __NEXT_DATA__, using structured data")
+                return listing
+        
+        return self._parse_listing_data(BeautifulSoup(html, 'lxml'), url, next_data)
+    
+    def _parse_html(self, html: Union[bytes, str], url: str) -> Dict:
+        """
+        Parse listing data from a page, reusing earlier parses of identical HTML
+        
+        Thread-safe, so scrape_listings can call it from worker threads.
+        
+        Args:
+            html: Page HTML as fetched (bytes) or rendered (str)
+            url: Listing URL
+            
+        Returns:
+            Listing dictionary (a fresh copy; callers may modify it)
+        """
+        raw = html.encode('utf-8') if isinstance(html, str) else html
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        key = (digest, url)
+        
+        with _parse_cache_lock:
+            listing = _parse_cache.get(key)
+            if listing is not None:
+                _parse_cache.move_to_end(key)
+                return dict(listing)
+        
+        disk_key = f"v{PARSE_CACHE_VERSION}:{digest.hex()}:{url}"
+        try:
+            listing = _parse_store().get(disk_key)
+        except Exception as e:
+            logger.warning("Parse cache read failed, parsing again: %s", e)
+            listing = None
+        
+        if listing is None:
+            listing = self._parse_page(html, raw, url)
+            try:
+                _parse_store().set(disk_key, listing, expire=PARSE_CACHE_TTL_SECONDS)
+            except Exception as e:
+                logger.warning("Parse cache write failed: %s", e)
+        
+        with _parse_cache_lock:
+            _parse_cache[key] = listing
+            while len(_parse_cache) > PARSE_CACHE_MAX_ENTRIES:
+                _parse_cache.popitem(last=False)
+        
+        return dict(listing)
+    
     def _scrape_with_playwright(self, url: str) -> Dict:
-        """Scrape using Playwright with stealth mode"""
+        """Scrape using headless Playwright, escalating to stealth mode on a bot check"""
         try:
             if not self.browser or not self.context:
-                print("Browser not initialized, reinitializing...")
+                logger.info("Browser not initialized, reinitializing...")
                 self._init_browser()
             
             if not self.browser:
-                print("Failed to initialize browser, falling back to requests")
+                logger.warning("Failed to initialize browser, falling back to requests")
                 return self._scrape_with_requests(url)
             
-            page = self.context.new_page()
+            # One page is reused across listings; reopen only if it died
+            if self._page is None or self._page.is_closed():
+                self._page = self._new_page()
+            page = self._page
             
-            # Apply stealth mode
-            stealth_sync(page)
-            
-            print(f"Loading page: {url}")
-            page.goto(url, wait_until='networkidle', timeout=30000)
+            logger.info("Loading page: %s", url)
+            response = page.goto(url, wait_until='domcontentloaded', timeout=30000)
+            if not self.stealth_mode and _looks_blocked(response, page.title()):
+                # Stay in stealth mode for the rest of the session once blocked
+                logger.info("Bot check on %s, switching to stealth mode", url)
+                self.stealth_mode = True
+                stealth_sync(page)
+                page.goto(url, wait_until='domcontentloaded', timeout=30000)
+            try:
+                # __NEXT_DATA__ is the only node parsing needs; don't wait for the network to idle
+                page.wait_for_selector(NEXT_DATA_SELECTOR, state='attached', timeout=8000)
+            except PlaywrightTimeoutError:
+                logger.debug("__NEXT_DATA__ did not appear, parsing page as loaded")
             
-            # Random delay to mimic human behavior
-            time.sleep(random.uniform(2, 4))
+            # Short jitter so requests don't arrive in lockstep
+            time.sleep(random.uniform(*JITTER_SECONDS))
             
             # Get page content
             html_content = page.content()
             
-            # Close the page (but keep browser open)
-            page.close()
+            logger.debug("Page loaded successfully (%d characters)", len(html_content))
             
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Debug: Print snippet
-            page_snippet = soup.get_text()[:300]
-            print(f"DEBUG - Page loaded successfully. Sample: {page_snippet[:150]}...")
-            
-            return self._parse_listing_data(soup, url)
+            return self._parse_html(html_content, url)
                 
         except Exception as e:
-            print(f"Error scraping with Playwright: {e}")
-            import traceback
-            traceback.print_exc()
-            print("Falling back to requests...")
+            logger.exception("Error scraping with Playwright, falling back to requests: %s", e)
             return self._scrape_with_requests(url)
     
     def _scrape_with_requests(self, url: str) -> Dict:
         """Scrape using requests + BeautifulSoup"""
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._session.get(url, timeout=10)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            return self._parse_listing_data(soup, url)
+            return self._parse_html(response.content, url)
             
         except Exception as e:
-            print(f"Error scraping with requests: {e}")
+            logger.error("Error scraping with requests: %s", e)
             return self._get_empty_listing_data(url)
     
-    def _parse_listing_data(self, soup: BeautifulSoup, url: str) -> Dict:
-        """Parse listing data from BeautifulSoup object"""
+    def _parse_listing_data(self, soup: BeautifulSoup, url: str, next_data: Optional[Dict] = None) -> Dict:
+        """
+        Parse listing data from BeautifulSoup object
+        
+        Args:
+            soup: Parsed page
+            url: Listing URL
+            next_data: Fields already extracted from __NEXT_DATA__, if the
+                caller has them; otherwise they are looked up in soup
+        """
         listing_data = self._get_empty_listing_data(url)
         
         # Try to extract from __NEXT_DATA__ JSON first (more reliable)
-        next_data = self._extract_from_next_data(soup)
+        if next_data is None:
+            next_data = self._extract_from_next_data(soup)
         if next_data:
-            print("DEBUG - Found __NEXT_DATA__, using structured data")
             listing_data.update(next_data)
-            return listing_data
         
-        print("DEBUG - __NEXT_DATA__ not found, falling back to HTML parsing")
+        # Only fields still unknown go through the HTML extractors
+        missing = {key for key, value in listing_data.items() if value is None}
+        if next_data:
+            if not missing:
+                logger.debug("Found __NEXT_DATA__, using structured data")
+                return listing_data
+            logger.debug("__NEXT_DATA__ incomplete, parsing HTML for: %s", ', '.join(sorted(missing)))
+        else:
+            logger.debug("__NEXT_DATA__ not found, falling back to HTML parsing")
         
-        # Fallback to HTML parsing
-        listing_data['bedrooms'] = self._extract_bedrooms(soup)
-        listing_data['bathrooms'] = self._extract_bathrooms(soup)
-        listing_data['price'] = self._extract_price(soup)
-        listing_data['address'] = self._extract_address(soup)
+        # The page text walk and phrase sweep are the expensive steps, so each
+        # runs at most once and only if an extractor that needs it will run;
+        # otherwise the empty defaults stand in
+        page_text = ''
+        page_hits: frozenset = frozenset()
+        amenity_nodes: List[Tag] = []
+        pet_nodes: List[Tag] = []
+        if missing & {'bedrooms', 'bathrooms', 'price'}:
+            page_text = soup.get_text()
+        if missing & _PHRASE_FIELDS:
+            page_hits = _PHRASE_MATCHER.find((page_text or soup.get_text()).lower())
+            amenity_nodes, pet_nodes = self._find_sections(soup)
         
-        lat, lon = self._extract_coordinates(soup)
-        listing_data['latitude'] = lat
-        listing_data['longitude'] = lon
+        if 'bedrooms' in missing:
+            listing_data['bedrooms'] = self._extract_bedrooms(soup, page_text)
+        if 'bathrooms' in missing:
+            listing_data['bathrooms'] = self._extract_bathrooms(page_text)
+        if 'price' in missing:
+            listing_data['price'] = self._extract_price(page_text)
+        if 'address' in missing:
+            listing_data['address'] = self._extract_address(soup)
         
-        listing_data['laundry'] = self._extract_laundry(soup)
+        if missing & {'latitude', 'longitude'}:
+            lat, lon = self._extract_coordinates(soup)
+            if 'latitude' in missing:
+                listing_data['latitude'] = lat
+            if 'longitude' in missing:
+                listing_data['longitude'] = lon
         
-        cats_allowed, pets_allowed = self._extract_pet_policy(soup)
-        listing_data['cats_allowed'] = cats_allowed
-        listing_data['pets_allowed'] = pets_allowed
+        if 'laundry' in missing:
+            listing_data['laundry'] = self._extract_laundry(page_hits, amenity_nodes)
         
-        return listing_data
-    
-    def _find_key_in_dict(self, obj: dict, target_key: str) -> Optional[any]:
-        """Recursively find a key in a nested dictionary"""
-        if target_key in obj:
-            return obj[target_key]
+        if missing & {'cats_allowed', 'pets_allowed'}:
+            cats_allowed, pets_allowed = self._extract_pet_policy(page_hits, pet_nodes)
+            if 'cats_allowed' in missing:
+                listing_data['cats_allowed'] = cats_allowed
+            if 'pets_allowed' in missing:
+                listing_data['pets_allowed'] = pets_allowed
         
-        for key, value in obj.items():
-            if isinstance(value, dict):
-                result = self._find_key_in_dict(value, target_key)
-                if result is not None:
-                    return result
-        return None
+        return listing_data
     
     def _extract_from_next_data(self, soup: BeautifulSoup) -> Optional[Dict]:
         """Extract data from __NEXT_DATA__ JSON (StreetEasy's structured data)"""
+        script_tag = soup.find('script', id='__NEXT_DATA__')
+        if not script_tag or not script_tag.string:
+            return None
+        return self._listing_from_next_data(script_tag.string)
+    
+    def _listing_from_next_data(self, blob: Union[bytes, str]) -> Optional[Dict]:
+        """Extract listing fields from the raw __NEXT_DATA__ JSON text"""
         try:
-            script_tag = soup.find('script', id='__NEXT_DATA__')
-            if not script_tag or not script_tag.string:
-                return None
-            
-            data = json.loads(script_tag.string)
+            data = _loads_json(blob)
             
-            # Use safe recursive search to find listing data
-            listing = (self._find_key_in_dict(data, 'listing') or 
-                      self._find_key_in_dict(data, 'listingData') or
-                      self._find_key_in_dict(data, 'property'))
+            # One breadth-first walk finds all candidate keys; first match wins by priority
+            found = _find_keys(data, _LISTING_KEYS)
+            listing = found.get('listing') or found.get('listingData') or found.get('property')
             
             if not listing:
-                print("DEBUG - __NEXT_DATA__ found but listing data not in expected location")
+                logger.debug("__NEXT_DATA__ found but listing data not in expected location")
                 return None
             
             result = {}
@@ -235,58 +732,63 @@ class StreetEasyScraper:
                 result['cats_allowed'] = None
                 result['pets_allowed'] = None
             
-            # Amenities - check both list and dict formats
+            # Amenities - check both list and dict formats; one pass collects
+            # codes, laundry phrases and pet wording for every amenity
             amenities = listing.get('amenities', [])
-            laundry_found = False
+            laundry = None
             
             if isinstance(amenities, list):
-                amenities_lower = []
-                amenity_codes = []
+                amenity_codes = set()
+                laundry_text = set()
+                pets_text = False
+                cats_text = False
+                no_cats_text = False
                 
                 for a in amenities:
                     if isinstance(a, dict):
                         # Handle amenity objects with code/name
-                        amenities_lower.append(str(a.get('name', '')).lower())
+                        name = str(a.get('name', '')).lower()
                         code = a.get('code') or a.get('id')
                         if code:
-                            amenity_codes.append(str(code))
+                            amenity_codes.add(str(code))
                     else:
-                        amenities_lower.append(str(a).lower())
+                        name = str(a).lower()
+                    
+                    for phrase, value in _AMENITY_LAUNDRY_PHRASES:
+                        if phrase in name:
+                            laundry_text.add(value)
+                    
+                    if 'allowed' in name or 'friendly' in name or 'ok' in name:
+                        pets_text = pets_text or 'pet' in name
+                        cats_text = cats_text or 'cat' in name
+                    no_cats_text = no_cats_text or 'no cat' in name
                 
-                # Check laundry using codes (15 = washer/dryer, 16 = laundry in building)
-                if '15' in amenity_codes or 'WASHER_DRYER' in amenity_codes:
-                    result['laundry'] = 'in_unit'
-                    laundry_found = True
-                elif '16' in amenity_codes or 'LAUNDRY_IN_BUILDING' in amenity_codes:
-                    result['laundry'] = 'in_building'
-                    laundry_found = True
-                
-                # Fallback to text matching
-                if not laundry_found:
-                    if any('in-unit laundry' in a or 'washer/dryer in unit' in a or 'washer dryer' in a for a in amenities_lower):
-                        result['laundry'] = 'in_unit'
-                    elif any('laundry in building' in a or 'laundry room' in a or 'common laundry' in a for a in amenities_lower):
-                        result['laundry'] = 'in_building'
-                    else:
-                        result['laundry'] = 'none'
+                # Check laundry using codes (15 = washer/dryer, 16 = laundry in building),
+                # then fall back to text matching
+                if amenity_codes & _IN_UNIT_CODES:
+                    laundry = 'in_unit'
+                elif amenity_codes & _IN_BUILDING_CODES:
+                    laundry = 'in_building'
+                elif 'in_unit' in laundry_text:
+                    laundry = 'in_unit'
+                elif 'in_building' in laundry_text:
+                    laundry = 'in_building'
                 
                 # Check pets from amenities if not found in petPolicy
                 if result['cats_allowed'] is None:
-                    result['pets_allowed'] = any('pet' in a and ('allowed' in a or 'friendly' in a or 'ok' in a) for a in amenities_lower)
-                    result['cats_allowed'] = any('cat' in a and ('allowed' in a or 'friendly' in a or 'ok' in a) for a in amenities_lower)
+                    result['pets_allowed'] = pets_text
+                    result['cats_allowed'] = cats_text
                     
                     # If pets allowed but cats not explicitly mentioned, assume cats included
-                    if result['pets_allowed'] and not result['cats_allowed']:
-                        if not any('no cat' in a for a in amenities_lower):
-                            result['cats_allowed'] = True
+                    if pets_text and not cats_text and not no_cats_text:
+                        result['cats_allowed'] = True
             
-            if not laundry_found:
-                result['laundry'] = 'none'
+            result['laundry'] = laundry or 'none'
             
             return result
             
         except Exception as e:
-            print(f"DEBUG - Error parsing __NEXT_DATA__: {e}")
+            logger.debug("Error parsing __NEXT_DATA__: %s", e)
             return None
     
     def _get_empty_listing_data(self, url: str) -> Dict:
@@ -304,74 +806,61 @@ class StreetEasyScraper:
             'cats_allowed': None,
         }
     
-    def _extract_bedrooms(self, soup: BeautifulSoup) -> Optional[int]:
+    def _extract_bedrooms(self, soup: BeautifulSoup, page_text: str) -> Optional[int]:
         """Extract number of bedrooms"""
-        page_text = soup.get_text()
-        
         # StreetEasy format: "2 rooms | 1 bed | 1 bath" or "2 rooms 1 bed 1 bath"
         # Look for pattern with pipe separator or just spaces
-        details_pattern = re.search(r'(\d+)\s+rooms?\s*[|\s]\s*(\d+)\s+beds?', page_text, re.IGNORECASE)
+        details_pattern = _ROOMS_BEDS_RE.search(page_text)
         if details_pattern:
-            print(f"DEBUG - Found bedrooms via rooms pattern: {details_pattern.group(2)}")
+            logger.debug("Found bedrooms via rooms pattern: %s", details_pattern.group(2))
             return int(details_pattern.group(2))
         
         # Look for "X bed" pattern anywhere (case insensitive, must have number)
-        bed_match = re.search(r'(\d+)\s+beds?(?:\s|[|\r\n]|$)', page_text, re.IGNORECASE)
+        bed_match = _BEDS_RE.search(page_text)
         if bed_match:
-            print(f"DEBUG - Found bedrooms: {bed_match.group(1)}")
+            logger.debug("Found bedrooms: %s", bed_match.group(1))
             return int(bed_match.group(1))
         
         # Look for "studio"
-        if re.search(r'\bstudio\b', page_text, re.IGNORECASE):
+        if _STUDIO_RE.search(page_text):
             # Make sure it's not a false positive
             title_elem = soup.find('h1')
             if title_elem and 'studio' in title_elem.get_text().lower():
-                print("DEBUG - Found studio apartment")
+                logger.debug("Found studio apartment")
                 return 0
         
-        print("DEBUG - Could not find bedroom count")
+        logger.debug("Could not find bedroom count")
         return None
     
-    def _extract_bathrooms(self, soup: BeautifulSoup) -> Optional[float]:
+    def _extract_bathrooms(self, page_text: str) -> Optional[float]:
         """Extract number of bathrooms"""
-        # StreetEasy specific: Look for "X bath" pattern
-        page_text = soup.get_text()
-        page_text = soup.get_text()
-        
-        # Look for "X bath" pattern with pipe or space separator
-        bath_match = re.search(r'([\d.]+)\s+baths?(?:\s|[|\r\n]|$)', page_text, re.IGNORECASE)
+        # StreetEasy specific: Look for "X bath" pattern with pipe or space separator
+        bath_match = _BATHS_RE.search(page_text)
         if bath_match:
-            print(f"DEBUG - Found bathrooms: {bath_match.group(1)}")
+            logger.debug("Found bathrooms: %s", bath_match.group(1))
             return float(bath_match.group(1))
         
-        print("DEBUG - Could not find bathroom count")
+        logger.debug("Could not find bathroom count")
         return None
     
-    def _extract_price(self, soup: BeautifulSoup) -> Optional[int]:
+    def _extract_price(self, page_text: str) -> Optional[int]:
         """Extract rental price"""
-        page_text = soup.get_text()
-        
         # StreetEasy format: "$2,500 FOR RENT" or "$2,500FOR RENT"
-        price_match = re.search(r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:FOR\s+)?RENT', page_text, re.IGNORECASE)
+        price_match = _PRICE_RE.search(page_text)
         if price_match:
             price_str = price_match.group(1).replace(',', '')
-            print(f"DEBUG - Found price: ${price_str}")
+            logger.debug("Found price: $%s", price_str)
             return int(float(price_str))
         
-        # Fallback: Find any dollar amount in reasonable range ($500-$50,000)
-        price_matches = re.findall(r'\$(\d{1,3}(?:,\d{3})*)', page_text)
-        for match in price_matches:
-            price_str = match.replace(',', '')
-            try:
-                price = int(price_str)
-                # Reasonable apartment rent range
-                if 500 <= price <= 50000:
-                    print(f"DEBUG - Found price (fallback): ${price}")
-                    return price
-            except ValueError:
-                continue
+        # Fallback: First dollar amount in reasonable range ($500-$50,000)
+        for match in _PRICE_FALLBACK_RE.finditer(page_text):
+            price = int(match.group(1).replace(',', ''))
+            # Reasonable apartment rent range
+            if 500 <= price <= 50000:
+                logger.debug("Found price (fallback): $%s", price)
+                return price
         
-        print("DEBUG - Could not find price")
+        logger.debug("Could not find price")
         return None
     
     def _extract_address(self, soup: BeautifulSoup) -> Optional[str]:
@@ -397,8 +886,11 @@ class StreetEasyScraper:
         # Look for JSON-LD structured data
         script_tags = soup.find_all('script', type='application/ld+json')
         for script in script_tags:
+            # Most JSON-LD blocks are unrelated schemas; only decode ones that can carry geo
+            if not script.string or 'geo' not in script.string:
+                continue
             try:
-                data = json.loads(script.string)
+                data = _loads_json(script.string)
                 if isinstance(data, dict) and 'geo' in data:
                     geo = data['geo']
                     return geo.get('latitude'), geo.get('longitude')
@@ -415,88 +907,86 @@ class StreetEasyScraper:
             except:
                 pass
         
-        # Look in JavaScript variables
+        # Look in JavaScript variables; a plain substring test rules out most
+        # scripts before either regex runs
         scripts = soup.find_all('script')
         for script in scripts:
-            if script.string:
+            text = script.string
+            if text and 'latitude' in text and 'longitude' in text:
                 # Look for lat/lng in JavaScript
-                lat_match = re.search(r'latitude["\']?\s*:\s*([-\d.]+)', script.string)
-                lon_match = re.search(r'longitude["\']?\s*:\s*([-\d.]+)', script.string)
+                lat_match = _LAT_RE.search(text)
+                lon_match = _LON_RE.search(text)
                 if lat_match and lon_match:
                     return float(lat_match.group(1)), float(lon_match.group(1))
         
         return None, None
     
-    def _extract_laundry(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract laundry information"""
-        # Look for amenities section
-        page_text = soup.get_text().lower()
-        
-        # Check for in-unit laundry
-        in_unit_patterns = [
-            'in-unit laundry', 'in unit laundry', 'washer/dryer in unit',
-            'washer and dryer in unit', 'w/d in unit', 'laundry in unit'
-        ]
-        for pattern in in_unit_patterns:
-            if pattern in page_text:
-                return 'in_unit'
+    def _find_sections(self, soup: BeautifulSoup) -> Tuple[List[Tag], List[Tag]]:
+        """
+        Collect amenity and pet-policy elements in one DOM walk
         
-        # Check for in-building laundry
-        in_building_patterns = [
-            'laundry in building', 'building laundry', 'common laundry',
-            'shared laundry', 'laundry room', 'laundry facilities'
-        ]
-        for pattern in in_building_patterns:
-            if pattern in page_text:
-                return 'in_building'
+        Returns:
+            (elements with an amenity/feature class, elements with a pet/policy class)
+        """
+        amenity_nodes = []
+        pet_nodes = []
+        for node in soup.find_all(class_=_SECTION_CLASS_RE):
+            classes = ' '.join(node.get('class', ()))
+            if _AMENITY_CLASS_RE.search(classes):
+                amenity_nodes.append(node)
+            if _PET_CLASS_RE.search(classes):
+                pet_nodes.append(node)
+        return amenity_nodes, pet_nodes
+    
+    def _extract_laundry(self, page_hits: frozenset, amenity_nodes: List[Tag]) -> Optional[str]:
+        """Extract laundry information (page_hits: phrases found in the page text)"""
+        # Check for in-unit laundry, then in-building laundry
+        if page_hits & _IN_UNIT_LAUNDRY:
+            return 'in_unit'
+        if page_hits & _IN_BUILDING_LAUNDRY:
+            return 'in_building'
         
         # Look in amenities list specifically
-        amenities = soup.find_all(class_=re.compile('amenity|feature', re.I))
-        for amenity in amenities:
-            text = amenity.get_text().lower()
-            for pattern in in_unit_patterns:
-                if pattern in text:
-                    return 'in_unit'
-            for pattern in in_building_patterns:
-                if pattern in text:
-                    return 'in_building'
+        for amenity in amenity_nodes:
+            hits = _PHRASE_MATCHER.find(amenity.get_text().lower())
+            if hits & _IN_UNIT_LAUNDRY:
+                return 'in_unit'
+            if hits & _IN_BUILDING_LAUNDRY:
+                return 'in_building'
         
         return 'none'
     
-    def _extract_pet_policy(self, soup: BeautifulSoup) -> tuple[bool, bool]:
+    def _extract_pet_policy(self, page_hits: frozenset, pet_nodes: List[Tag]) -> tuple[bool, bool]:
         """Extract pet policy, returns (cats_allowed, pets_allowed)"""
-        page_text = soup.get_text().lower()
-        
         cats_allowed = False
         pets_allowed = False
         
         # Check for explicit cat mentions
-        if any(phrase in page_text for phrase in ['cats allowed', 'cats ok', 'cat friendly']):
+        if page_hits & _CATS_OK:
             cats_allowed = True
             pets_allowed = True
         
         # Check for pets allowed generally
-        if any(phrase in page_text for phrase in ['pets allowed', 'pets ok', 'pet friendly', 'dogs and cats']):
+        if page_hits & _PETS_OK:
             pets_allowed = True
             # If pets allowed generally, assume cats are included unless explicitly stated otherwise
-            if 'no cats' not in page_text and 'cats not allowed' not in page_text:
+            if not page_hits & _NO_CATS:
                 cats_allowed = True
         
         # Check for no pets
-        if any(phrase in page_text for phrase in ['no pets', 'pets not allowed', 'no dogs or cats']):
+        if page_hits & _NO_PETS:
             cats_allowed = False
             pets_allowed = False
         
         # Look in specific pet policy sections
-        pet_sections = soup.find_all(class_=re.compile('pet|policy', re.I))
-        for section in pet_sections:
-            text = section.get_text().lower()
-            if 'cats allowed' in text or 'cats ok' in text:
+        for section in pet_nodes:
+            hits = _PHRASE_MATCHER.find(section.get_text().lower())
+            if 'cats allowed' in hits or 'cats ok' in hits:
                 cats_allowed = True
                 pets_allowed = True
-            elif 'pets allowed' in text or 'pets ok' in text:
+            elif 'pets allowed' in hits or 'pets ok' in hits:
                 pets_allowed = True
-                if 'no cats' not in text:
+                if 'no cats' not in hits:
                     cats_allowed = True
         
         return cats_allowed, pets_allowed
@@ -527,3 +1017,49 @@ class StreetEasyScraper:
         
         meets_requirements = len(failed) == 0
         return meets_requirements, failed
+    
+    def _requirement_masks(self, listings: List[Dict]) -> 'pd.DataFrame':
+        """Per-listing pass/fail for each requirement in validate_requirements"""
+        # Only batch validation needs pandas; importing it here keeps scraper import lean
+        import pandas as pd
+        
+        df = pd.DataFrame(listings).reindex(columns=['bedrooms', 'laundry', 'cats_allowed'])
+        return pd.DataFrame({
+            'bedrooms': df['bedrooms'].isin([1, 2]),
+            'laundry': df['laundry'].isin(['in_unit', 'in_building']),
+            # NaN is truthy under astype(bool), so missing values are masked out first
+            'cats_allowed': df['cats_allowed'].notna() & df['cats_allowed'].astype(bool),
+        })
+    
+    def validate_batch(self, listings: List[Dict]) -> 'np.ndarray':
+        """
+        Check many listings against the basic requirements at once
+        
+        Same rules as validate_requirements, evaluated column-wise.
+        
+        Args:
+            listings: Listing data dictionaries
+            
+        Returns:
+            Boolean array, True where a listing meets every requirement
+        """
+        import numpy as np
+        
+        if not listings:
+            return np.zeros(0, dtype=bool)
+        return self._requirement_masks(listings).all(axis=1).to_numpy()
+    
+    def requirement_failure_counts(self, listings: List[Dict]) -> Dict[str, int]:
+        """
+        Count how many listings fail each requirement
+        
+        Args:
+            listings: Listing data dictionaries
+            
+        Returns:
+            Dictionary of requirement name (bedrooms/laundry/cats_allowed) to
+            number of listings failing it
+        """
+        if not listings:
+            return {'bedrooms': 0, 'laundry': 0, 'cats_allowed': 0}
+        return {name: int(count) for name, count in (~self._requirement_masks(listings)).sum().items()}
@@ -4,6 +4,7 @@ Test script for address-based apartment evaluation
 
 import sys
 import os
+import logging
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -67,6 +68,7 @@ if __name__ == '__main__':
         sys.exit(1)
     
     address = sys.argv[1]
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'), format='%(message)s')
     result = test_address(address)
     
     if result:
@@ -4,23 +4,29 @@ Run this to test the scraper with a real listing URL
 """
 
 import sys
+import os
+import logging
 sys.path.insert(0, 'src')
 
 from scraper import StreetEasyScraper
 import json
 
 
-def test_scraper(url: str, use_selenium: bool = False):
+def test_scraper(url: str, use_selenium: bool = False, stealth: bool = False):
     """Test the scraper with a given URL"""
     print(f"\n{'='*70}")
     print(f"Testing StreetEasy Scraper")
     print(f"{'='*70}")
     print(f"URL: {url}")
-    print(f"Method: {'Playwright + Stealth' if not use_selenium else 'Legacy Selenium'}")
+    if use_selenium:
+        method = 'Legacy Selenium'
+    else:
+        method = 'Playwright + Stealth' if stealth else 'Headless Playwright (stealth on bot check)'
+    print(f"Method: {method}")
     print(f"{'='*70}\n")
     
     # Create scraper with context manager for proper cleanup
-    with StreetEasyScraper(use_playwright=not use_selenium) as scraper:
+    with StreetEasyScraper(use_playwright=not use_selenium, stealth_mode=stealth) as scraper:
         # Scrape listing
         print("Scraping listing...")
         listing = scraper.scrape_listing(url)
@@ -62,7 +68,7 @@ def test_scraper(url: str, use_selenium: bool = False):
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
-        print("Usage: python test_scraper.py <streeteasy_url> [--selenium]")
+        print("Usage: python test_scraper.py <streeteasy_url> [--selenium] [--stealth]")
         print("\nExample:")
         print("  python test_scraper.py 'https://streeteasy.com/building/...'")
         print("  python test_scraper.py 'https://streeteasy.com/rental/...' --selenium")
@@ -70,9 +76,12 @@ if __name__ == '__main__':
     
     url = sys.argv[1]
     use_selenium = '--selenium' in sys.argv or '-s' in sys.argv
+    stealth = '--stealth' in sys.argv
+    # LOG_LEVEL=DEBUG shows the scraper's per-field extraction details
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'), format='%(message)s')
     
     try:
-        listing, valid = test_scraper(url, use_selenium)
+        listing, valid = test_scraper(url, use_selenium, stealth)
         sys.exit(0 if valid else 1)
     except Exception as e:
         print(f"\n❌ ERROR: {e}")